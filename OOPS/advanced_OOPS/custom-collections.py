@@ -1,7 +1,9 @@
 from typing import List, Dict, Any, Iterator, Protocol, TypeVar, Generic, Optional
-from collections.abc import MutableSequence, Mapping
+from collections.abc import MutableSequence, Mapping, ItemsView, ValuesView
 import bisect
 import copy
+import random
+import time
 
 T = TypeVar('T')  # Generic type for our collections
 
@@ -48,61 +50,147 @@ class SortedList(MutableSequence[T]):
     def __str__(self):
         return str(self._data)
 
+class _Node:
+    """A doubly linked list node holding one cache entry."""
+    __slots__ = ("key", "value", "prev", "next")
+
+    def __init__(self, key=None, value=None):
+        self.key = key
+        self.value = value
+        self.prev: Optional[_Node] = None
+        self.next: Optional[_Node] = None
+
 class LRUCache(Mapping[str, T]):
     """
     A Least Recently Used (LRU) cache implementation.
     Demonstrates a custom mapping type with eviction policy.
+
+    A dict maps each key to its node in a doubly linked list ordered by usage
+    (oldest after the head sentinel, newest before the tail sentinel), so get,
+    set and eviction only relink a node and take O(1) time at any capacity.
     """
     def __init__(self, capacity: int = 100):
         self.capacity = capacity
-        self._cache: Dict[str, T] = {}
-        self._usage_order: List[str] = []  # Keys ordered by usage (newest at end)
+        self._cache: Dict[str, _Node] = {}
+        # Sentinels: the list is never empty, so linking needs no special cases
+        self._head = _Node()
+        self._tail = _Node()
+        self._head.next = self._tail
+        self._tail.prev = self._head
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _unlink(self, node: _Node) -> None:
+        """Remove a node from the usage list."""
+        node.prev.next = node.next
+        node.next.prev = node.prev
+    
+    def _append(self, node: _Node) -> None:
+        """Insert a node as the most recently used."""
+        last = self._tail.prev
+        last.next = node
+        node.prev = last
+        node.next = self._tail
+        self._tail.prev = node
     
     def __getitem__(self, key: str) -> T:
         """Get an item and mark it as recently used."""
-        if key not in self._cache:
+        node = self._cache.get(key)
+        if node is None:
+            self.misses += 1
             raise KeyError(key)
         
-        # Update usage order
-        self._usage_order.remove(key)
-        self._usage_order.append(key)
-        
-        return self._cache[key]
+        self.hits += 1
+        self._unlink(node)
+        self._append(node)
+        return node.value
     
     def __setitem__(self, key: str, value: T) -> None:
         """Set an item and mark it as recently used."""
-        if key in self._cache:
+        node = self._cache.get(key)
+        if node is not None:
             # Update existing key
-            self._usage_order.remove(key)
-        elif len(self._cache) >= self.capacity:
+            node.value = value
+            self._unlink(node)
+            self._append(node)
+            return
+        
+        if len(self._cache) >= self.capacity:
             # Evict least recently used item
-            lru_key = self._usage_order.pop(0)
-            del self._cache[lru_key]
+            lru = self._head.next
+            self._unlink(lru)
+            del self._cache[lru.key]
+            self.evictions += 1
         
-        # Add new item
-        self._cache[key] = value
-        self._usage_order.append(key)
+        node = _Node(key, value)
+        self._cache[key] = node
+        self._append(node)
     
     def __delitem__(self, key: str) -> None:
         """Remove an item from the cache."""
-        if key not in self._cache:
+        node = self._cache.pop(key, None)
+        if node is None:
             raise KeyError(key)
-        
-        del self._cache[key]
-        self._usage_order.remove(key)
+        self._unlink(node)
+    
+    def __contains__(self, key: object) -> bool:
+        """Check membership without marking the key as used or counting a hit."""
+        return key in self._cache
+    
+    def _nodes(self) -> List[_Node]:
+        """Snapshot of the nodes in usage order, safe to iterate while using the cache."""
+        nodes = []
+        node = self._head.next
+        while node is not self._tail:
+            nodes.append(node)
+            node = node.next
+        return nodes
     
     def __iter__(self) -> Iterator[str]:
-        """Iterate over keys in usage order."""
-        return iter(self._usage_order)
+        """Iterate over keys in usage order (least recently used first)."""
+        return iter([node.key for node in self._nodes()])
+    
+    def values(self) -> ValuesView:
+        """View of the values in usage order; reading it does not change the order."""
+        return _LRUValuesView(self)
+    
+    def items(self) -> ItemsView:
+        """View of the (key, value) pairs in usage order; reading it does not change the order."""
+        return _LRUItemsView(self)
     
     def __len__(self) -> int:
         """Return the number of items in the cache."""
         return len(self._cache)
     
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that found their key."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
     def __repr__(self) -> str:
         items = ", ".join(f"{k!r}: {v!r}" for k, v in self.items())
         return f"LRUCache({{{items}}})"
 
+class _LRUItemsView(ItemsView):
+    """Items view that reads the nodes directly instead of going through __getitem__."""
+    def __contains__(self, item) -> bool:
+        key, value = item
+        node = self._mapping._cache.get(key)
+        return node is not None and (node.value is value or node.value == value)
+    
+    def __iter__(self):
+        return iter([(node.key, node.value) for node in self._mapping._nodes()])
+
+class _LRUValuesView(ValuesView):
+    """Values view that reads the nodes directly instead of going through __getitem__."""
+    def __contains__(self, value) -> bool:
+        return any(v is value or v == value for v in self)
+    
+    def __iter__(self):
+        return iter([node.value for node in self._mapping._nodes()])
+
 class Observable(Generic[T]):
     """
     A generic observable value container with change notifications.
@@ -227,6 +315,9 @@ try:
 except KeyError:
     print("Expected: key2 was evicted")
 
+print(f"'key3' in cache: {'key3' in cache}")  # Does not change usage order
+print(f"Hits: {cache.hits}, misses: {cache.misses}, evictions: {cache.evictions}")
+
 print("\n---- Observable Demo ----")
 def value_changed(old_value, new_value):
     print(f"Value changed from {old_value} to {new_value}")
@@ -245,4 +336,24 @@ for value in [30, 70, 20, 40, 60, 80, 35]:
 
 print(f"Inorder traversal: {tree.inorder_traversal()}")
 print(f"Search for 40: {tree.search(40)}")
-print(f"Search for 55: {tree.search(55)}")  # Should return None
\ No newline at end of file
+print(f"Search for 55: {tree.search(55)}")  # Should return None
+
+if __name__ == "__main__":
+    print("\n---- LRUCache Benchmark ----")
+    # Latency per operation stays flat as the capacity grows
+    for capacity in [100, 10_000, 1_000_000]:
+        bench = LRUCache(capacity=capacity)
+        for i in range(capacity):
+            bench[f"k{i}"] = i
+        keys = [f"k{random.randrange(2 * capacity)}" for _ in range(50_000)]
+        start = time.perf_counter()
+        for i, key in enumerate(keys):
+            try:
+                bench[key]
+            except KeyError:
+                bench[key] = i
+        elapsed = time.perf_counter() - start
+        print(
+            f"capacity {capacity:>9,}: {elapsed / len(keys) * 1e9:6.0f} ns/op, "
+            f"hit rate {bench.hit_rate:.2f}, evictions {bench.evictions:,}"
+        )
@@ -0,0 +1,239 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from transaction_costs import cost_factor
+
+# Metric columns consumed by plot_model_performance, in display order
+METRIC_COLUMNS = ["ROI", "CAGR", "Number_of_Trades", "Final_Capital", "Accuracy"]
+
+INITIAL_CAPITAL = 100_000.0
+TRADING_DAYS_PER_YEAR = 252
+
+
+def bar_returns(prices):
+    """
+    Simple returns between consecutive bars along the last axis.
+
+    Parameters:
+    - prices (array-like): Close prices shaped (..., n_bars).
+
+    Returns:
+    - np.ndarray: Returns shaped (..., n_bars - 1).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    return prices[..., 1:] / prices[..., :-1] - 1.0
+
+
+def positions_from_signals(signals):
+    """
+    Convert model signals into long/flat positions.
+
+    The signal on bar t decides the position held from bar t to bar t + 1, so the
+    signal on the last bar never earns a return and is dropped.
+
+    Parameters:
+    - signals (array-like): Model signals shaped (..., n_bars); values > 0 mean "long".
+
+    Returns:
+    - np.ndarray: Boolean positions shaped (..., n_bars - 1).
+    """
+    return np.asarray(signals)[..., :-1] > 0
+
+
+def count_trades(positions):
+    """
+    Count the trades (flat -> long entries) in each position series.
+
+    Parameters:
+    - positions (np.ndarray): Boolean positions shaped (..., n_periods).
+
+    Returns:
+    - np.ndarray: Number of entries shaped (...).
+    """
+    entries = positions[..., 1:] & ~positions[..., :-1]
+    return positions[..., 0].astype(np.int64) + entries.sum(axis=-1)
+
+
+def equity_curve(prices, signals, initial_capital=INITIAL_CAPITAL, cost=0.0):
+    """
+    Mark-to-market equity of a long/flat strategy on every bar.
+
+    Parameters:
+    - prices (array-like): Close prices shaped (..., n_bars).
+    - signals (array-like): Model signals broadcastable against prices.
+    - initial_capital (float): Starting capital of every account.
+    - cost (float): Proportional cost charged on every trade, deducted at entry.
+
+    Returns:
+    - np.ndarray: Equity shaped like the broadcast of prices and signals; the first bar
+      equals initial_capital.
+    """
+    positions = positions_from_signals(signals)
+    growth = 1.0 + positions * bar_returns(prices)
+    if cost:
+        entries = positions.copy()
+        entries[..., 1:] &= ~positions[..., :-1]
+        growth = growth * cost_factor(entries, cost)
+    equity = np.empty(growth.shape[:-1] + (growth.shape[-1] + 1,))
+    equity[..., 0] = initial_capital
+    np.cumprod(growth, axis=-1, out=equity[..., 1:])
+    equity[..., 1:] *= initial_capital
+    return equity
+
+
+def run_backtest(
+    prices,
+    signals,
+    initial_capital=INITIAL_CAPITAL,
+    periods_per_year=TRADING_DAYS_PER_YEAR,
+    cost=0.0,
+):
+    """
+    Vectorized long/flat backtest producing the metrics plotted by plot_model_performance.
+
+    Prices and signals are broadcast against each other, so a (n_stocks, n_bars) price
+    array can be evaluated against (n_models, n_stocks, n_bars) signals in one call.
+
+    Parameters:
+    - prices (array-like): Close prices shaped (..., n_bars).
+    - signals (array-like): Model signals broadcastable against prices; values > 0 mean "long".
+    - initial_capital (float): Starting capital of every account.
+    - periods_per_year (int): Bars per year, used to annualize CAGR.
+    - cost (float): Proportional cost charged on every trade (e.g., 0.003 for 0.3%).
+
+    Returns:
+    - dict: Maps every name in METRIC_COLUMNS to an array shaped like the broadcast of
+      prices[..., 0] and signals[..., 0].
+    """
+    returns = bar_returns(prices)
+    positions = positions_from_signals(signals)
+    if returns.shape[-1] < 1:
+        raise ValueError("At least two bars are needed to run a backtest")
+
+    n_trades = count_trades(positions)
+    growth = np.prod(1.0 + positions * returns, axis=-1) * cost_factor(n_trades, cost)
+    years = returns.shape[-1] / periods_per_year
+
+    # A bar counts as a correct call when the long/flat decision matches the realized direction
+    correct = positions == (returns > 0)
+
+    return {
+        "ROI": growth - 1.0,
+        "CAGR": growth ** (1.0 / years) - 1.0,
+        "Number_of_Trades": n_trades,
+        "Final_Capital": initial_capital * growth,
+        "Accuracy": correct.mean(axis=-1),
+    }
+
+
+def buy_and_hold(
+    prices, initial_capital=INITIAL_CAPITAL, periods_per_year=TRADING_DAYS_PER_YEAR
+):
+    """
+    Metrics of the passive "Actual Market" benchmark.
+
+    Holding the stock is not a trading decision, so Number_of_Trades is 0 and Accuracy is NaN.
+
+    Parameters:
+    - prices (array-like): Close prices shaped (..., n_bars).
+    - initial_capital (float): Starting capital of every account.
+    - periods_per_year (int): Bars per year, used to annualize CAGR.
+
+    Returns:
+    - dict: Maps every name in METRIC_COLUMNS to an array shaped prices[..., 0].
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    results = run_backtest(
+        prices, np.ones(prices.shape), initial_capital, periods_per_year
+    )
+    results["Number_of_Trades"] = np.zeros_like(results["Number_of_Trades"])
+    results["Accuracy"] = np.full(results["Accuracy"].shape, np.nan)
+    return results
+
+
+def results_frame(results, models, stocks):
+    """
+    Flatten backtest results into the long DataFrame layout used by plot_model_performance.
+
+    Parameters:
+    - results (dict): Metric name -> array shaped (n_models, n_stocks), e.g. from run_backtest.
+    - models (list): Model names, one per row of the arrays.
+    - stocks (list): Stock names, one per column of the arrays.
+
+    Returns:
+    - pd.DataFrame: One row per (model, stock) with columns 'Model', 'Stock' and the metrics.
+    """
+    shape = (len(models), len(stocks))
+    frame = pd.DataFrame(
+        {
+            "Model": np.repeat(np.asarray(models, dtype=object), len(stocks)),
+            "Stock": np.tile(np.asarray(stocks, dtype=object), len(models)),
+        }
+    )
+    # Known metrics first in display order, then any extra metrics (e.g. risk metrics)
+    extra = [column for column in results if column not in METRIC_COLUMNS]
+    for column in METRIC_COLUMNS + extra:
+        if column in results:
+            frame[column] = np.broadcast_to(results[column], shape).ravel()
+    return frame
+
+
+def merge_metric_columns(df, extra):
+    """
+    Add the metric columns of another per-(model, stock) frame to a results DataFrame.
+
+    Parameters:
+    - df (pd.DataFrame): Results with columns 'Model' and 'Stock'.
+    - extra (pd.DataFrame): Frame with 'Model', 'Stock' and the columns to add.
+
+    Returns:
+    - pd.DataFrame: df with the extra columns (NaN for pairs missing from extra), keeping
+      the label dtypes of df (e.g. categoricals from results_io).
+    """
+    keys = ["Model", "Stock"]
+    merged = df.astype({k: object for k in keys}).merge(
+        extra.astype({k: object for k in keys}), on=keys, how="left"
+    )
+    return merged.astype({k: df[k].dtype for k in keys})
+
+
+# Example usage: backtest random signals for a synthetic stock universe
+if __name__ == "__main__":
+    rng = np.random.default_rng(42)
+    n_stocks, n_bars = 1000, 2 * TRADING_DAYS_PER_YEAR
+    models = [
+        "Attention_CNN_BiLSTM_STFT",
+        "MFA_STFT",
+        "Attention_CNN_BiLSTM_Multi_Indicator",
+        "MFA_Multi_indicator",
+    ]
+    stocks = [f"STOCK{i:04d}" for i in range(n_stocks)]
+
+    # Geometric random walk prices and one random long/flat signal array per model
+    log_returns = rng.normal(0.0004, 0.02, size=(n_stocks, n_bars - 1))
+    prices = 100.0 * np.exp(
+        np.concatenate(
+            [np.zeros((n_stocks, 1)), np.cumsum(log_returns, axis=1)], axis=1
+        )
+    )
+    signals = rng.random((len(models), n_stocks, n_bars)) > 0.5
+
+    start = time.perf_counter()
+    model_results = run_backtest(prices, signals)
+    elapsed = time.perf_counter() - start
+    combinations = len(models) * n_stocks
+    print(
+        f"Backtested {combinations} stock x model combinations in {elapsed:.3f}s ({combinations / elapsed:,.0f}/s)"
+    )
+
+    market_results = buy_and_hold(prices)
+    df = pd.concat(
+        [
+            results_frame(market_results, ["Actual Market"], stocks),
+            results_frame(model_results, models, stocks),
+        ],
+        ignore_index=True,
+    )
+    print(df.head(10))
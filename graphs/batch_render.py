@@ -0,0 +1,135 @@
+import os
+import time
+
+# Select the non-interactive Agg backend before pyplot is imported anywhere,
+# so the renderer works on servers without a display.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from stock_market_metrics import render_metric_files
+
+
+def _init_worker():
+    """Make sure every worker process renders with the headless Agg backend."""
+    matplotlib.use("Agg")
+    sns.set_style("whitegrid")
+
+
+def _render_job(plot_df, metric, stocks, output_dir, formats, cost, cache, mode):
+    """Render one (metric, stock group) chart and return the written file paths."""
+    return render_metric_files(
+        plot_df, metric, stocks, output_dir, formats, cost=cost, cache=cache, mode=mode
+    )
+
+
+def render_model_performance_batch(
+    df,
+    metrics,
+    stock_groups,
+    output_dir,
+    formats=("png", "svg"),
+    max_workers=None,
+    cost=None,
+    cache=None,
+    mode="bar",
+):
+    """
+    Render every metric chart for every stock group headlessly, spreading the work over a process pool.
+
+    Each group is written to its own sub-directory, e.g. '<output_dir>/<group>/ROI.png';
+    a group named None is written to output_dir itself.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics (e.g., 'ROI', 'CAGR').
+    - metrics (list): List of metric column names to plot (e.g., ['ROI', 'CAGR']).
+    - stock_groups (dict or list): Mapping of group name to a list of stocks, or a plain list of
+      stock lists (named 'group_000', 'group_001', ...).
+    - output_dir (str): Root directory the charts are written to.
+    - formats (tuple): File formats to write for every chart (e.g., ('png', 'svg')).
+    - max_workers (int, optional): Number of worker processes. Defaults to the CPU count;
+      1 renders everything in the current process.
+    - cost (float, optional): Per-trade transaction cost already applied to df. It is shown
+      in the titles and the files get a '_with_cost' suffix.
+    - cache (PlotCache, optional): Shared on-disk cache; unchanged charts are copied from it
+      instead of being rendered again.
+    - mode (str): Chart type, 'bar' or 'heatmap'.
+
+    Returns:
+    - dict: Maps (group, metric) to the list of written file paths.
+    """
+    if not isinstance(stock_groups, dict):
+        stock_groups = {f"group_{i:03d}": group for i, group in enumerate(stock_groups)}
+
+    # Ship each worker only the rows of its own group instead of the whole frame
+    jobs = []
+    for group, stocks in stock_groups.items():
+        group_df = df[df["Stock"].isin(stocks)]
+        group_dir = (
+            output_dir if group is None else os.path.join(output_dir, str(group))
+        )
+        for metric in metrics:
+            jobs.append(
+                (
+                    (group, metric),
+                    (
+                        group_df,
+                        metric,
+                        list(stocks),
+                        group_dir,
+                        formats,
+                        cost,
+                        cache,
+                        mode,
+                    ),
+                )
+            )
+
+    results = {}
+    if max_workers == 1:
+        _init_worker()
+        for key, args in jobs:
+            results[key] = _render_job(*args)
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker
+    ) as executor:
+        futures = {executor.submit(_render_job, *args): key for key, args in jobs}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+# Example usage: render the sample charts for two stock groups without a display
+if __name__ == "__main__":
+    import pandas as pd
+
+    rows = []
+    for model, uplift in [("Actual Market", 0.0), ("MFA_STFT", 0.1)]:
+        for stock, roi in [
+            ("AAPL", 0.42),
+            ("RIL", 0.25),
+            ("HDFCBANK", 0.24),
+            ("TSLA", 0.8),
+        ]:
+            rows.append(
+                {
+                    "Model": model,
+                    "Stock": stock,
+                    "ROI": roi + uplift,
+                    "CAGR": (roi + uplift) / 2,
+                }
+            )
+    df = pd.DataFrame(rows)
+    groups = {"us": ["AAPL", "TSLA"], "india": ["RIL", "HDFCBANK"]}
+
+    start = time.perf_counter()
+    written = render_model_performance_batch(df, ["ROI", "CAGR"], groups, "charts")
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {len(written)} charts in {elapsed:.2f}s")
+    for (group, metric), paths in sorted(written.items()):
+        print(f"{group:>6} {metric:<5} -> {', '.join(paths)}")
@@ -0,0 +1,186 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import TRADING_DAYS_PER_YEAR, merge_metric_columns
+
+# Metrics with bootstrap confidence intervals
+CI_METRICS = ["ROI", "CAGR", "Accuracy"]
+
+
+def ci_columns(metric):
+    """Names of the lower and upper confidence bound columns of a metric."""
+    return f"{metric}_CI_Low", f"{metric}_CI_High"
+
+
+def _resample_indices(rng, n_resamples, n_periods, block_size):
+    """Bootstrap indices shaped (n_resamples, n_periods); blocks keep autocorrelation."""
+    if block_size <= 1:
+        return rng.integers(0, n_periods, size=(n_resamples, n_periods))
+    # Moving-block bootstrap: glue together random runs of block_size consecutive periods
+    n_blocks = -(-n_periods // block_size)
+    starts = rng.integers(0, n_periods - block_size + 1, size=(n_resamples, n_blocks))
+    indices = starts[..., None] + np.arange(block_size)
+    return indices.reshape(n_resamples, -1)[:, :n_periods]
+
+
+def bootstrap_series(
+    returns,
+    correct=None,
+    n_resamples=10_000,
+    chunk_size=1_000,
+    confidence=0.95,
+    block_size=1,
+    periods_per_year=TRADING_DAYS_PER_YEAR,
+    seed=None,
+):
+    """
+    Bootstrap confidence intervals of ROI, CAGR and Accuracy for one return series.
+
+    Resamples are drawn chunk_size at a time, so peak memory is about
+    chunk_size x n_periods values however many resamples are requested.
+
+    Parameters:
+    - returns (array-like): Per-period strategy returns shaped (n_periods,).
+    - correct (array-like, optional): Per-period booleans, True where the model called the
+      direction right. Accuracy is skipped when omitted.
+    - n_resamples (int): Number of bootstrap resamples.
+    - chunk_size (int): Resamples evaluated per vectorized batch.
+    - confidence (float): Confidence level of the intervals (e.g., 0.95).
+    - block_size (int): Length of resampled blocks; 1 is the plain i.i.d. bootstrap.
+    - periods_per_year (int): Periods per year, used to annualize CAGR.
+    - seed (int or np.random.SeedSequence, optional): Seed of the resampling.
+
+    Returns:
+    - dict: Maps each metric in CI_METRICS to a (low, high) tuple.
+    """
+    log_growth = np.log1p(np.asarray(returns, dtype=np.float64))
+    n_periods = len(log_growth)
+    hits = None if correct is None else np.asarray(correct, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+
+    totals = np.empty(n_resamples)
+    accuracy = np.empty(n_resamples) if hits is not None else None
+    for start in range(0, n_resamples, chunk_size):
+        size = min(chunk_size, n_resamples - start)
+        indices = _resample_indices(rng, size, n_periods, block_size)
+        totals[start : start + size] = log_growth[indices].sum(axis=1)
+        if hits is not None:
+            accuracy[start : start + size] = hits[indices].mean(axis=1)
+
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    quantiles = [tail, 100.0 - tail]
+    low, high = np.expm1(np.percentile(totals, quantiles))
+    years = n_periods / periods_per_year
+    intervals = {
+        "ROI": (low, high),
+        "CAGR": (
+            (1.0 + low) ** (1.0 / years) - 1.0,
+            (1.0 + high) ** (1.0 / years) - 1.0,
+        ),
+    }
+    if accuracy is not None:
+        intervals["Accuracy"] = tuple(np.percentile(accuracy, quantiles))
+    return intervals
+
+
+def _bootstrap_job(args):
+    returns, correct, options, seed = args
+    return bootstrap_series(returns, correct, seed=seed, **options)
+
+
+def bootstrap_frame(
+    returns,
+    models,
+    stocks,
+    correct=None,
+    max_workers=None,
+    seed=None,
+    **options,
+):
+    """
+    Bootstrap confidence intervals for every (model, stock) series, in parallel across series.
+
+    Parameters:
+    - returns (array-like): Strategy returns shaped (n_models, n_stocks, n_periods).
+    - models (list): Model names, one per first axis entry.
+    - stocks (list): Stock names, one per second axis entry.
+    - correct (array-like, optional): Direction hits shaped like returns.
+    - max_workers (int, optional): Worker processes; 1 runs in the current process.
+    - seed (int, optional): Root seed; every series gets an independent child seed.
+    - **options: Passed to bootstrap_series (n_resamples, chunk_size, confidence, ...).
+
+    Returns:
+    - pd.DataFrame: One row per (model, stock) with 'Model', 'Stock' and the
+      '<metric>_CI_Low' / '<metric>_CI_High' columns.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    pairs = [(m, s) for m in range(len(models)) for s in range(len(stocks))]
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+    jobs = [
+        (returns[m, s], None if correct is None else correct[m, s], options, child)
+        for (m, s), child in zip(pairs, seeds)
+    ]
+
+    if max_workers == 1:
+        intervals = [_bootstrap_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            intervals = list(executor.map(_bootstrap_job, jobs, chunksize=8))
+
+    rows = []
+    for (m, s), interval in zip(pairs, intervals):
+        row = {"Model": models[m], "Stock": stocks[s]}
+        for metric, (low, high) in interval.items():
+            low_column, high_column = ci_columns(metric)
+            row[low_column], row[high_column] = low, high
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def add_confidence_intervals(df, ci_df):
+    """
+    Merge bootstrap intervals into a results DataFrame so the charts draw error bars.
+
+    Parameters:
+    - df (pd.DataFrame): Results with columns 'Model', 'Stock' and the metrics.
+    - ci_df (pd.DataFrame): Output of bootstrap_frame.
+
+    Returns:
+    - pd.DataFrame: df with the interval columns added (NaN where no interval exists).
+    """
+    return merge_metric_columns(df, ci_df)
+
+
+# Example usage: confidence intervals for two models on synthetic data
+if __name__ == "__main__":
+    from backtest import bar_returns, positions_from_signals
+
+    rng = np.random.default_rng(13)
+    models = ["MFA_Multi_indicator", "Attention_CNN_BiLSTM_Multi_Indicator"]
+    stocks = [f"STOCK{i:02d}" for i in range(20)]
+    n_bars = 2 * TRADING_DAYS_PER_YEAR
+    prices = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0005, 0.02, (len(stocks), n_bars)), axis=1)
+    )
+    signals = rng.random((len(models), len(stocks), n_bars)) > 0.45
+
+    market = bar_returns(prices)
+    positions = positions_from_signals(signals)
+    strategy = positions * market
+
+    start = time.perf_counter()
+    ci = bootstrap_frame(
+        strategy,
+        models,
+        stocks,
+        correct=positions == (market > 0),
+        n_resamples=5_000,
+        seed=1,
+    )
+    print(
+        f"Bootstrapped {len(ci)} series x 5,000 resamples in {time.perf_counter() - start:.2f}s"
+    )
+    print(ci.head())
@@ -0,0 +1,189 @@
+"""
+Command-line entry point for the graphs tooling.
+
+    python cli.py compute --cost 0.003 --output results.npz
+    python cli.py export --input results.npz --output roi.csv --metrics ROI
+    python cli.py plot --input results.npz --metrics ROI CAGR --output-dir charts
+
+Only the standard library is imported up front; numpy/pandas are imported by the
+commands that need them and matplotlib/seaborn only by 'plot', so '--help' and the
+data-only commands start quickly. '--timings' reports what each import cost.
+"""
+
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import importlib
+import sys
+
+METRICS = ["ROI", "CAGR", "Number_of_Trades", "Final_Capital", "Accuracy"]
+
+# Seconds spent importing each lazily loaded module, in import order
+IMPORT_TIMES = {}
+
+
+def lazy_import(name):
+    """Import a module on first use and record how long the import took."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES[name] = time.perf_counter() - start
+    return module
+
+
+def _load(args):
+    """Results named by --input, or the built-in sample results."""
+    if args.input is None:
+        return lazy_import("sample_results").sample_results_frame()
+    return lazy_import("results_io").load_results(args.input)
+
+
+def _filter(df, models=None, stocks=None):
+    select_rows = lazy_import("results_io").select_rows
+    if models:
+        df = df[select_rows(df, "Model", models)]
+    if stocks:
+        df = df[select_rows(df, "Stock", stocks)]
+    return df
+
+
+def _save(df, path):
+    if path.endswith(".json"):
+        df.to_json(path, orient="records")
+    else:
+        lazy_import("results_io").save_results(df, path)
+    print(f"Wrote {len(df)} rows to {path}")
+
+
+def cmd_compute(args):
+    """Apply a per-trade cost to the results and save or summarize them."""
+    df = _load(args)
+    if args.cost:
+        transaction_costs = lazy_import("transaction_costs")
+        df = df[df["Model"] != "Actual Market"]
+        df = transaction_costs.with_transaction_cost(df, args.cost)
+    if args.output:
+        _save(df, args.output)
+    else:
+        metrics = [m for m in METRICS if m in df.columns]
+        print(df.groupby("Model", sort=False, observed=True)[metrics].mean())
+
+
+def cmd_export(args):
+    """Write a filtered subset of the results as CSV, NPZ or JSON."""
+    df = _filter(_load(args), args.models, args.stocks)
+    if args.metrics:
+        df = df[["Model", "Stock"] + args.metrics]
+    _save(df, args.output)
+
+
+def cmd_plot(args):
+    """Render the comparison charts to files."""
+    df = _filter(_load(args), args.models, args.stocks)
+    if args.cost:
+        df = df[df["Model"] != "Actual Market"]
+        df = lazy_import("transaction_costs").with_transaction_cost(df, args.cost)
+    stocks = args.stocks or list(dict.fromkeys(df["Stock"].astype(str)))
+    cache = None
+    if args.cache:
+        cache = lazy_import("plot_cache").PlotCache(args.cache)
+
+    if args.workers != 1:
+        batch_render = lazy_import("batch_render")
+        paths = batch_render.render_model_performance_batch(
+            df,
+            args.metrics,
+            # Same layout as the serial path: every chart directly in output_dir
+            {None: stocks},
+            args.output_dir,
+            tuple(args.formats),
+            max_workers=args.workers,
+            cost=args.cost or None,
+            cache=cache,
+            mode=args.mode,
+        )
+        n_files = sum(len(p) for p in paths.values())
+    else:
+        # Headless backend before pyplot is imported by the plotting module
+        lazy_import("matplotlib").use("Agg")
+        metrics_module = lazy_import("stock_market_metrics")
+        paths = metrics_module.plot_model_performance(
+            df,
+            args.metrics,
+            stocks,
+            output_dir=args.output_dir,
+            formats=tuple(args.formats),
+            cost=args.cost or None,
+            cache=cache,
+            mode=args.mode,
+        )
+        n_files = len(paths)
+    print(f"Rendered {n_files} chart files to {args.output_dir}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Compute, export and plot model comparison results."
+    )
+    parser.add_argument(
+        "--timings", action="store_true", help="report import and run times on stderr"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_input(command):
+        command.add_argument(
+            "--input",
+            help="results file (.csv or .npz); defaults to the sample results",
+        )
+
+    compute = commands.add_parser("compute", help=cmd_compute.__doc__)
+    add_input(compute)
+    compute.add_argument("--cost", type=float, default=0.0, help="per-trade cost")
+    compute.add_argument("--output", help="write .csv/.npz/.json instead of printing")
+    compute.set_defaults(handler=cmd_compute)
+
+    export = commands.add_parser("export", help=cmd_export.__doc__)
+    add_input(export)
+    export.add_argument("--output", required=True, help=".csv, .npz or .json file")
+    export.add_argument("--models", nargs="+")
+    export.add_argument("--stocks", nargs="+")
+    export.add_argument("--metrics", nargs="+")
+    export.set_defaults(handler=cmd_export)
+
+    plot = commands.add_parser("plot", help=cmd_plot.__doc__)
+    add_input(plot)
+    plot.add_argument("--metrics", nargs="+", default=METRICS)
+    plot.add_argument("--models", nargs="+")
+    plot.add_argument("--stocks", nargs="+")
+    plot.add_argument("--output-dir", default="charts")
+    plot.add_argument("--formats", nargs="+", default=["png"])
+    plot.add_argument("--mode", choices=["bar", "heatmap"], default="bar")
+    plot.add_argument("--cost", type=float, default=0.0, help="per-trade cost")
+    plot.add_argument("--cache", help="directory of the rendered chart cache")
+    plot.add_argument(
+        "--workers", type=int, default=1, help="render processes (0: one per CPU)"
+    )
+    plot.set_defaults(handler=cmd_plot)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "workers", 1) == 0:
+        args.workers = None
+    started = time.perf_counter()
+    args.handler(args)
+    if args.timings:
+        print(f"startup: {(started - _START) * 1000:.1f}ms", file=sys.stderr)
+        for name, seconds in IMPORT_TIMES.items():
+            print(f"import {name}: {seconds * 1000:.1f}ms", file=sys.stderr)
+        total = time.perf_counter() - started
+        print(f"{args.command}: {total * 1000:.1f}ms", file=sys.stderr)
+        print(f"matplotlib loaded: {'matplotlib' in sys.modules}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import merge_metric_columns
+
+# Columns produced by direction_frame, in display order
+DIRECTION_COLUMNS = ["Accuracy", "Precision", "Recall"]
+
+
+def to_direction(values, three_way=False):
+    """
+    Map predictions or realized returns to integer direction classes.
+
+    Non-finite values (NaN, inf) get the flat / not-up class; mask them out of the
+    counts with the valid argument of confusion_matrices.
+
+    Parameters:
+    - values (array-like): Signals, returns or booleans (True means "up").
+    - three_way (bool): Use classes 0 = down, 1 = flat, 2 = up instead of 0 = not up, 1 = up.
+
+    Returns:
+    - np.ndarray: Integer class labels shaped like values.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        values = np.where(np.isfinite(values), values, 0.0)
+    if three_way:
+        return (np.sign(values) + 1).astype(np.intp)
+    return (values > 0).astype(np.intp)
+
+
+def confusion_matrices(predicted, realized, n_classes=2, valid=None):
+    """
+    Confusion matrices of many series in one np.bincount pass.
+
+    Every (series, predicted class, realized class) triple is encoded as one integer,
+    so a single bincount over all bars of all series fills every matrix at once.
+
+    Parameters:
+    - predicted (array-like): Predicted classes shaped (..., n_bars), from to_direction.
+    - realized (array-like): Realized classes shaped like predicted.
+    - n_classes (int): Number of classes (2, or 3 for three-way directions).
+    - valid (array-like, optional): Boolean mask of bars to count (e.g. excluding NaN returns).
+
+    Returns:
+    - np.ndarray: Counts shaped (..., n_classes, n_classes), indexed [predicted, realized].
+    """
+    predicted, realized = np.broadcast_arrays(predicted, realized)
+    leading = predicted.shape[:-1]
+    n_series = int(np.prod(leading))
+    series = np.broadcast_to(
+        np.arange(n_series).reshape(leading + (1,)), predicted.shape
+    )
+    codes = (series * n_classes + predicted) * n_classes + realized
+    if valid is not None:
+        codes = codes[np.broadcast_to(valid, codes.shape)]
+    counts = np.bincount(codes.ravel(), minlength=n_series * n_classes * n_classes)
+    return counts.reshape(leading + (n_classes, n_classes))
+
+
+def scores_from_confusion(confusion, positive=-1):
+    """
+    Accuracy, precision and recall from confusion matrices.
+
+    Parameters:
+    - confusion (np.ndarray): Counts shaped (..., n_classes, n_classes) from confusion_matrices.
+    - positive (int): Class treated as positive for precision and recall (default: the last
+      class, i.e. "up").
+
+    Returns:
+    - dict: 'Accuracy', 'Precision' and 'Recall' arrays shaped (...); NaN where undefined.
+    """
+    confusion = np.asarray(confusion, dtype=np.float64)
+    total = confusion.sum(axis=(-2, -1))
+    correct = np.trace(confusion, axis1=-2, axis2=-1)
+    hits = confusion[..., positive, positive]
+    predicted_positive = confusion[..., positive, :].sum(axis=-1)
+    actual_positive = confusion[..., :, positive].sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "Accuracy": np.where(total > 0, correct / total, np.nan),
+            "Precision": np.where(
+                predicted_positive > 0, hits / predicted_positive, np.nan
+            ),
+            "Recall": np.where(actual_positive > 0, hits / actual_positive, np.nan),
+        }
+
+
+def direction_frame(predicted, realized, models, stocks, three_way=False):
+    """
+    Direction metrics for every (model, stock) pair, in the graphs DataFrame layout.
+
+    Parameters:
+    - predicted (array-like): Predicted directions shaped (n_models, n_stocks, n_bars)
+      (signals, returns or booleans; > 0 means "up"). Non-finite bars are ignored.
+    - realized (array-like): Realized returns or directions broadcastable to predicted,
+      e.g. shaped (n_stocks, n_bars). Non-finite bars are ignored.
+    - models (list): Model names, one per first axis entry.
+    - stocks (list): Stock names, one per second axis entry.
+    - three_way (bool): Score down/flat/up instead of up vs. not up.
+
+    Returns:
+    - pd.DataFrame: One row per (model, stock) with 'Model', 'Stock', 'Accuracy',
+      'Precision' and 'Recall'.
+    """
+    predicted = np.asarray(predicted, dtype=np.float64)
+    realized = np.asarray(realized, dtype=np.float64)
+    n_classes = 3 if three_way else 2
+    confusion = confusion_matrices(
+        to_direction(predicted, three_way),
+        to_direction(realized, three_way),
+        n_classes,
+        valid=np.isfinite(predicted) & np.isfinite(realized),
+    )
+    scores = scores_from_confusion(confusion)
+    frame = pd.DataFrame(
+        {
+            "Model": np.repeat(np.asarray(models, dtype=object), len(stocks)),
+            "Stock": np.tile(np.asarray(stocks, dtype=object), len(models)),
+        }
+    )
+    for column in DIRECTION_COLUMNS:
+        frame[column] = scores[column].ravel()
+    return frame
+
+
+def add_direction_metrics(df, direction_df):
+    """
+    Replace the Accuracy column (and add Precision/Recall) of a results DataFrame.
+
+    Pairs without predictions, such as the 'Actual Market' benchmark, get NaN instead of
+    a hand-entered None.
+
+    Parameters:
+    - df (pd.DataFrame): Results with columns 'Model', 'Stock' and the metrics.
+    - direction_df (pd.DataFrame): Output of direction_frame.
+
+    Returns:
+    - pd.DataFrame: df with computed direction metrics.
+    """
+    replaced = [column for column in DIRECTION_COLUMNS if column in direction_df]
+    return merge_metric_columns(
+        df.drop(columns=replaced, errors="ignore"), direction_df
+    )
+
+
+# Example usage: score noisy direction forecasts for a synthetic universe
+if __name__ == "__main__":
+    from sample_results import MODELS, STOCKS, sample_results_frame
+
+    rng = np.random.default_rng(17)
+    models = MODELS[1:]
+    n_bars = 504
+    realized = rng.normal(0.0005, 0.02, (len(STOCKS), n_bars))
+    # Each model sees the true direction with a different amount of noise
+    noise = rng.normal(0.0, 1.0, (len(models), len(STOCKS), n_bars))
+    skill = np.array([0.5, 0.6, 2.0, 1.5])[:, None, None]
+    predicted = np.sign(realized) * skill + noise
+
+    start = time.perf_counter()
+    scores = direction_frame(predicted, realized, models, STOCKS)
+    print(
+        f"Scored {len(scores)} series in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+
+    df = add_direction_metrics(sample_results_frame(), scores)
+    print(df[["Model", "Stock", "Accuracy", "Precision", "Recall"]].head(10))
@@ -0,0 +1,229 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest import METRIC_COLUMNS, buy_and_hold, results_frame, run_backtest
+
+# Per-process state set up once by _init_worker
+_WORKER = {}
+
+# Below this many bars to backtest (summed over all pairs, times the model weights) the
+# pairs are evaluated in the calling process unless max_workers asks for a pool; starting
+# one would cost more than it saves
+MIN_PARALLEL_BARS = 20_000_000
+
+# Batches submitted per worker process, so a slow batch can be balanced by the others
+BATCHES_PER_WORKER = 4
+
+
+def moving_average_signal(prices, window=20):
+    """Example signal model: long while the close is above its moving average."""
+    csum = np.cumsum(np.insert(prices, 0, 0.0))
+    average = np.full(len(prices), np.nan)
+    average[window - 1 :] = (csum[window:] - csum[:-window]) / window
+    return prices > average
+
+
+def _listed(prices):
+    """Bars of a NaN-padded price row from its first quote on (empty if it has none)."""
+    valid = ~np.isnan(prices)
+    return prices[np.argmax(valid) :] if valid.any() else prices[:0]
+
+
+def _init_worker(shm_name, shape, dtype, models, cost):
+    """Attach the shared price matrix once per worker process."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER["shm"] = shm  # Keep the mapping alive for the lifetime of the worker
+    _WORKER["prices"] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _WORKER["models"] = models
+    _WORKER["cost"] = cost
+
+
+def _evaluate_pair(model, row):
+    """Backtest one (model, stock) pair against the shared prices."""
+    # Stocks with a shorter history are NaN-padded at the start
+    prices = _listed(_WORKER["prices"][row])
+    if len(prices) < 2:
+        # Too short to backtest; report the pair instead of failing the whole run
+        return model, row, dict.fromkeys(METRIC_COLUMNS, np.nan)
+    signals = _WORKER["models"][model](prices)
+    metrics = run_backtest(prices, signals, cost=_WORKER["cost"])
+    return model, row, {name: metrics[name].item() for name in METRIC_COLUMNS}
+
+
+def _evaluate_batch(pairs):
+    """Backtest a batch of (model, stock row) pairs in one task."""
+    return [_evaluate_pair(model, row) for model, row in pairs]
+
+
+def schedule_pairs(models, n_bars, model_weights=None):
+    """
+    Order (model, stock row) jobs longest first, by bars to process times model weight.
+
+    Starting the most expensive jobs first keeps the last few workers from idling behind
+    one long straggler (longest-processing-time-first scheduling).
+
+    Parameters:
+    - models (list): Model names.
+    - n_bars (np.ndarray): Valid bars per stock row.
+    - model_weights (dict, optional): Relative cost of one bar per model (default 1).
+
+    Returns:
+    - list: (model, row) tuples in submission order.
+    """
+    model_weights = model_weights or {}
+    jobs = [
+        (n_bars[row] * model_weights.get(model, 1.0), model, row)
+        for model in models
+        for row in range(len(n_bars))
+    ]
+    jobs.sort(key=lambda job: job[0], reverse=True)
+    return [(model, row) for _, model, row in jobs]
+
+
+def batch_pairs(jobs, n_batches):
+    """
+    Deal jobs ordered longest first into n_batches batches of similar total cost.
+
+    Job i goes to batch i % n_batches, so every batch gets a share of the long and the
+    short jobs, and the batches themselves stay ordered longest first.
+
+    Returns:
+    - list: Non-empty lists of (model, row) tuples.
+    """
+    return [jobs[i::n_batches] for i in range(min(n_batches, len(jobs)))]
+
+
+def evaluate_models(
+    prices,
+    stocks,
+    models,
+    cost=0.0,
+    max_workers=None,
+    model_weights=None,
+    on_result=None,
+    include_market=True,
+):
+    """
+    Evaluate every (model, stock) pair in a process pool over shared-memory prices.
+
+    The pairs are dealt into a few batches per worker so each task amortizes its
+    scheduling and pickling overhead; unless max_workers is given, small workloads (fewer
+    than MIN_PARALLEL_BARS weighted bars in total) are evaluated in the calling process
+    instead. Pairs with fewer than two bars get NaN metrics.
+
+    Parameters:
+    - prices (array-like): Close prices shaped (n_stocks, n_bars); shorter histories are
+      NaN-padded at the start.
+    - stocks (list): Stock names, one per price row.
+    - models (dict): Maps model name to a picklable signal function prices -> signals.
+    - cost (float): Proportional cost charged per trade.
+    - max_workers (int, optional): Number of worker processes (defaults to the CPU count);
+      1 evaluates everything in the calling process.
+    - model_weights (dict, optional): Relative per-bar cost of each model, used for
+      ordering and for the MIN_PARALLEL_BARS threshold.
+    - on_result (callable, optional): Called as on_result(row_dict) as each pair finishes.
+    - include_market (bool): Also add the 'Actual Market' buy-and-hold rows.
+
+    Returns:
+    - pd.DataFrame: One row per (model, stock) with columns 'Model', 'Stock' and the metrics.
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    n_bars = (~np.isnan(prices)).sum(axis=1)
+    jobs = schedule_pairs(list(models), n_bars, model_weights)
+
+    rows = []
+
+    def collect(results):
+        for model, row, metrics in results:
+            result = {"Model": model, "Stock": stocks[row], **metrics}
+            rows.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    weights = model_weights or {}
+    work = n_bars.sum() * sum(weights.get(model, 1.0) for model in models)
+    if max_workers == 1 or (max_workers is None and work < MIN_PARALLEL_BARS):
+        _WORKER.update(prices=prices, models=dict(models), cost=cost)
+        try:
+            for model, row in jobs:
+                collect([_evaluate_pair(model, row)])
+        finally:
+            _WORKER.clear()
+    else:
+        _evaluate_in_pool(prices, models, cost, jobs, max_workers, collect)
+
+    df = pd.DataFrame(rows, columns=["Model", "Stock"] + METRIC_COLUMNS)
+    if include_market:
+        market = [
+            (
+                buy_and_hold(listed)
+                if len(listed) >= 2
+                else dict.fromkeys(METRIC_COLUMNS, np.nan)
+            )
+            for listed in map(_listed, prices)
+        ]
+        market = {name: np.array([m[name] for m in market]) for name in METRIC_COLUMNS}
+        df = pd.concat(
+            [results_frame(market, ["Actual Market"], stocks), df], ignore_index=True
+        )
+    # Order rows by model, then stock, regardless of completion order
+    order = {model: i for i, model in enumerate(["Actual Market", *models])}
+    stock_order = {stock: i for i, stock in enumerate(stocks)}
+    return df.sort_values(
+        ["Model", "Stock"],
+        key=lambda column: column.map(order if column.name == "Model" else stock_order),
+        ignore_index=True,
+    )
+
+
+def _evaluate_in_pool(prices, models, cost, jobs, max_workers, collect):
+    """Evaluate batches of jobs in a process pool and pass each batch's results to collect."""
+    n_workers = max_workers or os.cpu_count() or 1
+    batches = batch_pairs(jobs, n_workers * BATCHES_PER_WORKER)
+
+    # Copy the prices into shared memory once; workers map it instead of unpickling copies
+    shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    try:
+        shared = np.ndarray(prices.shape, dtype=prices.dtype, buffer=shm.buf)
+        shared[:] = prices
+        initargs = (shm.name, prices.shape, prices.dtype, dict(models), cost)
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            futures = [executor.submit(_evaluate_batch, batch) for batch in batches]
+            for future in as_completed(futures):
+                collect(future.result())
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Example usage: evaluate moving-average models over a synthetic universe
+if __name__ == "__main__":
+    rng = np.random.default_rng(21)
+    n_stocks, n_bars = 400, 2520
+    stocks = [f"STOCK{i:03d}" for i in range(n_stocks)]
+    prices = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0003, 0.02, (n_stocks, n_bars)), axis=1)
+    )
+    # Give some stocks a shorter history
+    for row in range(0, n_stocks, 7):
+        prices[row, : rng.integers(0, n_bars // 2)] = np.nan
+
+    models = {
+        "MA_20": partial(moving_average_signal, window=20),
+        "MA_50": partial(moving_average_signal, window=50),
+        "MA_200": partial(moving_average_signal, window=200),
+    }
+    start = time.perf_counter()
+    df = evaluate_models(prices, stocks, models, cost=0.003)
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {len(df)} model x stock rows in {elapsed:.2f}s")
+    print(df.head(8))
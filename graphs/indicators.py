@@ -0,0 +1,265 @@
+import time
+
+import numpy as np
+
+# Indicator set used by the *_Multi_Indicator models; names map to IndicatorEngine methods
+DEFAULT_INDICATORS = {
+    "sma": {"window": 20},
+    "ema": {"span": 20},
+    "rsi": {"period": 14},
+    "macd": {"fast": 12, "slow": 26, "signal": 9},
+    "bollinger": {"window": 20, "num_std": 2.0},
+    "atr": {"period": 14},
+}
+
+
+def span_alpha(span):
+    """Smoothing factor of an EMA with the given span (pandas' ewm(span=...) convention)."""
+    return 2.0 / (span + 1.0)
+
+
+def ema(x, alpha, initial=None, block_size=256):
+    """
+    Exponential moving average along the last axis of a 2-D (series x time) array.
+
+    The recurrence y[t] = (1 - alpha) * y[t-1] + alpha * x[t] is unrolled over blocks of
+    block_size bars: inside a block every output is a fixed weighted sum of the block's
+    inputs plus the decayed carry-in, so each block is one matrix product for all series.
+    Only the carry crosses block boundaries, which keeps the weights well conditioned.
+
+    Parameters:
+    - x (array-like): Values shaped (n_series, n_bars).
+    - alpha (float): Smoothing factor in (0, 1].
+    - initial (array-like, optional): EMA value before the first bar, shaped (n_series,).
+      Defaults to seeding with the first bar.
+    - block_size (int): Bars unrolled per matrix product.
+
+    Returns:
+    - tuple: (ema shaped like x, last EMA value per series) - pass the latter back as
+      `initial` to continue the recurrence over new bars.
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    n_series, n_bars = x.shape
+    out = np.empty_like(x)
+    if n_bars == 0:
+        return out, initial
+    carry = x[:, 0].copy() if initial is None else np.asarray(initial, dtype=np.float64)
+
+    decay = 1.0 - alpha
+    size = min(block_size, n_bars)
+    lags = np.arange(size)[:, None] - np.arange(size)[None, :]
+    weights = np.where(lags >= 0, alpha * decay ** np.maximum(lags, 0), 0.0)
+    carry_decay = decay ** np.arange(1, size + 1)
+
+    for start in range(0, n_bars, size):
+        block = x[:, start : start + size]
+        width = block.shape[1]
+        out[:, start : start + width] = (
+            block @ weights[:width, :width].T + carry[:, None] * carry_decay[:width]
+        )
+        carry = out[:, start + width - 1]
+    return out, carry.copy()
+
+
+def rolling_mean(x, window):
+    """Rolling mean along the last axis; the first window - 1 bars are NaN."""
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= window:
+        csum = np.cumsum(np.pad(x, ((0, 0), (1, 0))), axis=1)
+        out[:, window - 1 :] = (csum[:, window:] - csum[:, :-window]) / window
+    return out
+
+
+def rolling_std(x, window):
+    """Rolling population standard deviation along the last axis; first window - 1 bars are NaN."""
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    offset = np.nanmean(x, axis=1, keepdims=True)
+    centered = x - offset
+    mean = rolling_mean(centered, window)
+    variance = rolling_mean(centered * centered, window) - mean * mean
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+class IndicatorEngine:
+    """
+    Computes a configurable set of technical indicators over (stocks x time) price arrays.
+
+    compute() evaluates each indicator in one vectorized pass over the whole history.
+    append() extends the indicators with new bars using only the carried EMA states and a
+    short tail of past closes, so live updates never recompute history.
+    """
+
+    def __init__(self, indicators=None):
+        """
+        Parameters:
+        - indicators (dict, optional): Maps an indicator name ('sma', 'ema', 'rsi', 'macd',
+          'bollinger', 'atr') to its parameters. Defaults to DEFAULT_INDICATORS.
+        """
+        indicators = DEFAULT_INDICATORS if indicators is None else indicators
+        for name in indicators:
+            if not hasattr(self, f"_{name}"):
+                raise ValueError(f"Unknown indicator: {name}")
+        self.indicators = {name: dict(params) for name, params in indicators.items()}
+        windows = [
+            params["window"]
+            for name, params in self.indicators.items()
+            if name in ("sma", "bollinger")
+        ]
+        # Past closes needed by the windowed indicators (and at least one for diffs)
+        self.lookback = max([1] + [window - 1 for window in windows])
+        self.reset()
+
+    def reset(self):
+        """Forget all history."""
+        self._state = {}
+        self._tail = None
+        self.n_bars = 0
+
+    def compute(self, close, high=None, low=None):
+        """
+        Compute every configured indicator over a full history.
+
+        Parameters:
+        - close (array-like): Close prices shaped (n_stocks, n_bars).
+        - high (array-like, optional): High prices, required by 'atr'.
+        - low (array-like, optional): Low prices, required by 'atr'.
+
+        Returns:
+        - dict: Maps output names (e.g. 'rsi_14', 'macd', 'bb_upper') to arrays shaped
+          (n_stocks, n_bars).
+        """
+        self.reset()
+        return self.append(close, high, low)
+
+    def append(self, close, high=None, low=None):
+        """
+        Extend the indicators with new bars.
+
+        Parameters:
+        - close (array-like): New close prices shaped (n_stocks, n_new_bars).
+        - high (array-like, optional): New high prices, required by 'atr'.
+        - low (array-like, optional): New low prices, required by 'atr'.
+
+        Returns:
+        - dict: Indicator values for the new bars only, each shaped (n_stocks, n_new_bars).
+        """
+        close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+        if high is not None:
+            high = np.atleast_2d(np.asarray(high, dtype=np.float64))
+            low = np.atleast_2d(np.asarray(low, dtype=np.float64))
+
+        history = close if self._tail is None else np.hstack([self._tail, close])
+        n_history = history.shape[1] - close.shape[1]
+        prev_close = None if self._tail is None else self._tail[:, -1]
+
+        out = {}
+        for name, params in self.indicators.items():
+            method = getattr(self, f"_{name}")
+            out.update(
+                method(close, history, n_history, prev_close, high, low, **params)
+            )
+
+        self._tail = history[:, -self.lookback :].copy()
+        self.n_bars += close.shape[1]
+        return out
+
+    def _ema_state(self, key, x, alpha):
+        """Continue the EMA stored under key over x and save its new carry."""
+        values, self._state[key] = ema(x, alpha, self._state.get(key))
+        return values
+
+    def _sma(self, close, history, n_history, prev_close, high, low, window):
+        return {f"sma_{window}": rolling_mean(history, window)[:, n_history:]}
+
+    def _ema(self, close, history, n_history, prev_close, high, low, span):
+        return {f"ema_{span}": self._ema_state(f"ema_{span}", close, span_alpha(span))}
+
+    def _rsi(self, close, history, n_history, prev_close, high, low, period):
+        previous = history[:, n_history - 1 : -1] if prev_close is not None else None
+        if previous is None:
+            # The very first bar has no change; seed the averages with the second bar
+            delta = np.diff(close, axis=1)
+        else:
+            delta = close - previous
+        gains = self._ema_state(
+            f"rsi_{period}_gain", np.maximum(delta, 0.0), 1.0 / period
+        )
+        losses = self._ema_state(
+            f"rsi_{period}_loss", np.maximum(-delta, 0.0), 1.0 / period
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + gains / losses)
+        rsi = np.where(losses == 0, np.where(gains == 0, 50.0, 100.0), rsi)
+        if previous is None:
+            rsi = np.hstack([np.full((close.shape[0], 1), np.nan), rsi])
+        return {f"rsi_{period}": rsi}
+
+    def _macd(
+        self, close, history, n_history, prev_close, high, low, fast, slow, signal
+    ):
+        line = self._ema_state("macd_fast", close, span_alpha(fast)) - self._ema_state(
+            "macd_slow", close, span_alpha(slow)
+        )
+        signal_line = self._ema_state("macd_signal", line, span_alpha(signal))
+        return {
+            "macd": line,
+            "macd_signal": signal_line,
+            "macd_hist": line - signal_line,
+        }
+
+    def _bollinger(
+        self, close, history, n_history, prev_close, high, low, window, num_std
+    ):
+        middle = rolling_mean(history, window)[:, n_history:]
+        width = num_std * rolling_std(history, window)[:, n_history:]
+        return {
+            "bb_middle": middle,
+            "bb_upper": middle + width,
+            "bb_lower": middle - width,
+        }
+
+    def _atr(self, close, history, n_history, prev_close, high, low, period):
+        if high is None or low is None:
+            raise ValueError("The 'atr' indicator needs high and low prices")
+        previous = np.hstack(
+            [
+                (close[:, :1] if prev_close is None else prev_close[:, None]),
+                close[:, :-1],
+            ]
+        )
+        true_range = np.maximum.reduce(
+            [high - low, np.abs(high - previous), np.abs(low - previous)]
+        )
+        return {
+            f"atr_{period}": self._ema_state(f"atr_{period}", true_range, 1.0 / period)
+        }
+
+
+# Example usage: full computation vs. incremental appends on a synthetic universe
+if __name__ == "__main__":
+    rng = np.random.default_rng(5)
+    n_stocks, n_bars = 1000, 2520
+    close = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0003, 0.02, (n_stocks, n_bars)), axis=1)
+    )
+    spread = close * rng.uniform(0.0, 0.02, close.shape)
+    high, low = close + spread, close - spread
+
+    engine = IndicatorEngine()
+    start = time.perf_counter()
+    full = engine.compute(close, high, low)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(full)} indicator series for {n_stocks} stocks x {n_bars} bars in {elapsed:.2f}s"
+    )
+
+    # Replay the last 20 bars one at a time and compare with the full computation
+    live = IndicatorEngine()
+    live.compute(close[:, :-20], high[:, :-20], low[:, :-20])
+    for t in range(n_bars - 20, n_bars):
+        step = live.append(close[:, t : t + 1], high[:, t : t + 1], low[:, t : t + 1])
+    print(
+        "Incremental matches full:",
+        all(np.allclose(step[name][:, -1], full[name][:, -1]) for name in full),
+    )
@@ -0,0 +1,249 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+
+# Latency percentiles reported by MicroBatcher.stats
+PERCENTILES = (50, 95, 99)
+
+_STOP = object()
+
+
+class NumpyStandInModel:
+    """
+    CPU stand-in for the compared neural models, for exercising the inference harness.
+
+    Any backend works with MicroBatcher if it has predict(batch) taking an array shaped
+    (batch_size, window, n_features) and returning one score per row; this one is a
+    small random two-layer network whose cost grows with the batch like a real model's,
+    plus a fixed per-call delay standing in for a framework's dispatch overhead, so
+    batching effects are measurable without a deep-learning runtime.
+    """
+
+    def __init__(
+        self, window=60, n_features=5, hidden=256, call_overhead=0.0005, seed=None
+    ):
+        """
+        Parameters:
+        - window (int): Bars per input sample.
+        - n_features (int): Features per bar.
+        - hidden (int): Width of the hidden layer.
+        - call_overhead (float): Seconds added to every predict call.
+        - seed (int, optional): Seed of the random weights.
+        """
+        rng = np.random.default_rng(seed)
+        self.window = window
+        self.n_features = n_features
+        self.call_overhead = call_overhead
+        scale = 1.0 / np.sqrt(window * n_features)
+        self.w1 = rng.normal(0.0, scale, (window * n_features, hidden)).astype(
+            np.float32
+        )
+        self.w2 = rng.normal(0.0, 1.0 / np.sqrt(hidden), hidden).astype(np.float32)
+
+    def predict(self, batch):
+        """Probability that the next bar closes up, one per sample."""
+        if self.call_overhead:
+            time.sleep(self.call_overhead)
+        x = np.asarray(batch, dtype=np.float32).reshape(len(batch), -1)
+        return 1.0 / (1.0 + np.exp(-(np.tanh(x @ self.w1) @ self.w2)))
+
+
+class MicroBatcher:
+    """
+    Thread-backed micro-batching queue in front of an inference backend.
+
+    submit() enqueues one sample and returns a Future. A worker thread takes the oldest
+    pending sample and keeps collecting until max_batch_size samples are waiting or
+    max_latency seconds have passed since that sample arrived, then runs the whole
+    batch through backend.predict in one call and resolves the Futures. Per-request
+    latency and batch sizes are recorded for stats().
+    """
+
+    def __init__(self, backend, max_batch_size=64, max_latency=0.002):
+        """
+        Parameters:
+        - backend (object): Model with predict(batch) -> one score per sample.
+        - max_batch_size (int): Largest batch passed to the backend.
+        - max_latency (float): Longest time (seconds) a sample waits for its batch to fill.
+        """
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._queue = queue.Queue()
+        self._latencies = []
+        self._batch_sizes = []
+        self._started = None
+        self._finished = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, sample):
+        """
+        Queue one sample for inference; raises RuntimeError once the batcher is closed.
+
+        Parameters:
+        - sample (array-like): One input shaped (window, n_features).
+
+        Returns:
+        - concurrent.futures.Future: Resolves to the backend's score for the sample.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed MicroBatcher")
+            now = time.perf_counter()
+            if self._started is None:
+                self._started = now
+            self._queue.put((now, sample, future))
+        return future
+
+    def close(self):
+        """Finish the pending requests and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = item[0] + self.max_latency
+            stop = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch):
+        # Drop requests cancelled while queued; the rest can no longer be cancelled
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            scores = self.backend.predict(np.stack([sample for _, sample, _ in batch]))
+            if len(scores) != len(batch):
+                raise ValueError(
+                    f"Backend returned {len(scores)} scores for {len(batch)} samples"
+                )
+        except Exception as exc:
+            for _, _, future in batch:
+                _resolve(future.set_exception, exc)
+            return
+        done = time.perf_counter()
+        for (submitted, _, future), score in zip(batch, scores):
+            _resolve(future.set_result, score)
+            self._latencies.append(done - submitted)
+        self._batch_sizes.append(len(batch))
+        self._finished = done
+
+    def stats(self):
+        """
+        Throughput and latency of the requests served so far.
+
+        Returns:
+        - dict: 'requests', 'throughput' (requests per second from first submit to last
+          result), 'mean_batch_size' and 'p50'/'p95'/'p99' latencies in milliseconds.
+        """
+        n = len(self._latencies)
+        if n == 0:
+            return {"requests": 0}
+        elapsed = max(self._finished - self._started, 1e-12)
+        stats = {
+            "requests": n,
+            "throughput": n / elapsed,
+            "mean_batch_size": float(np.mean(self._batch_sizes)),
+        }
+        latencies = np.percentile(self._latencies, PERCENTILES) * 1000.0
+        stats.update({f"p{p}": value for p, value in zip(PERCENTILES, latencies)})
+        return stats
+
+
+def _resolve(setter, value):
+    """Set a Future's outcome, ignoring one that was already resolved elsewhere."""
+    try:
+        setter(value)
+    except InvalidStateError:
+        pass
+
+
+def sliding_samples(features, window):
+    """
+    Every input window of a (n_bars, n_features) feature matrix, as zero-copy views.
+
+    Returns:
+    - np.ndarray: Samples shaped (n_bars - window + 1, window, n_features).
+    """
+    views = np.lib.stride_tricks.sliding_window_view(features, window, axis=0)
+    return np.moveaxis(views, -1, 1)
+
+
+# Example usage: one-at-a-time calls vs. micro-batched requests from many client threads
+if __name__ == "__main__":
+    from sample_results import MODELS
+
+    rng = np.random.default_rng(22)
+    n_requests, n_clients = 20_000, 32
+    backends = {model: NumpyStandInModel(seed=i) for i, model in enumerate(MODELS[1:])}
+    backend = backends["Attention_CNN_BiLSTM_Multi_Indicator"]
+    samples = sliding_samples(
+        rng.normal(size=(n_requests + backend.window - 1, backend.n_features)),
+        backend.window,
+    )
+
+    start = time.perf_counter()
+    for sample in samples[:2_000]:
+        backend.predict(sample[None])
+    unbatched = 2_000 / (time.perf_counter() - start)
+    print(f"One sample per call: {unbatched:,.0f} requests/s")
+
+    def client(batcher, rows):
+        futures = [batcher.submit(samples[row]) for row in rows]
+        for future in futures:
+            future.result()
+
+    with MicroBatcher(backend, max_batch_size=128, max_latency=0.002) as batcher:
+        threads = [
+            threading.Thread(
+                target=client, args=(batcher, range(c, n_requests, n_clients))
+            )
+            for c in range(n_clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    stats = batcher.stats()
+    print(
+        f"Micro-batched: {stats['throughput']:,.0f} requests/s, "
+        f"mean batch {stats['mean_batch_size']:.1f}, latency ms "
+        + ", ".join(f"p{p} {stats[f'p{p}']:.2f}" for p in PERCENTILES)
+    )
@@ -0,0 +1,234 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Risk metrics added to the results DataFrame, in display order
+RISK_OF_LOSS_COLUMNS = ["VaR", "CVaR", "Probability_of_Ruin"]
+
+
+class QuantileHistogram:
+    """
+    Mergeable fixed-bin histogram of terminal log growths for streaming quantiles.
+
+    Memory is fixed by the number of bins however many values are added, and two
+    histograms with the same bins merge by adding counts, so chunks simulated in
+    different processes combine exactly. Alongside the counts every bin keeps the sum of
+    the simple returns that fell into it, which makes tail means (CVaR) cheap.
+    """
+
+    __slots__ = ("low", "high", "n_bins", "counts", "sums")
+
+    def __init__(self, low=-10.0, high=10.0, n_bins=20_000):
+        """
+        Parameters:
+        - low (float): Lower edge of the first bin (log growth); smaller values land in it.
+        - high (float): Upper edge of the last bin; larger values land in it.
+        - n_bins (int): Number of bins; the quantile error is at most one bin width.
+        """
+        self.low = low
+        self.high = high
+        self.n_bins = n_bins
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.sums = np.zeros(n_bins)
+
+    @property
+    def width(self):
+        return (self.high - self.low) / self.n_bins
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def update(self, log_growth):
+        """Add terminal log growths."""
+        log_growth = np.asarray(log_growth, dtype=np.float64)
+        bins = np.clip(
+            ((log_growth - self.low) / self.width).astype(np.int64), 0, self.n_bins - 1
+        )
+        self.counts += np.bincount(bins, minlength=self.n_bins)
+        self.sums += np.bincount(
+            bins, weights=np.expm1(log_growth), minlength=self.n_bins
+        )
+
+    def merge(self, other):
+        """Add the values of another histogram with the same bins."""
+        if (other.low, other.high, other.n_bins) != (self.low, self.high, self.n_bins):
+            raise ValueError("Histograms must share their bins to be merged")
+        self.counts += other.counts
+        self.sums += other.sums
+        return self
+
+    def _locate(self, q):
+        """Bin holding quantile q and the fraction of that bin below it."""
+        cumulative = np.cumsum(self.counts)
+        target = q * cumulative[-1]
+        index = min(int(np.searchsorted(cumulative, target)), self.n_bins - 1)
+        below = cumulative[index - 1] if index > 0 else 0
+        fraction = (target - below) / max(self.counts[index], 1)
+        return index, below, fraction
+
+    def quantile(self, q):
+        """Approximate q-quantile of the log growths, interpolated inside its bin."""
+        index, _, fraction = self._locate(q)
+        return self.low + (index + fraction) * self.width
+
+    def tail_mean(self, q):
+        """Mean simple return of the lowest q fraction of paths."""
+        index, below, fraction = self._locate(q)
+        total = self.sums[:index].sum() + fraction * self.sums[index]
+        return total / max(below + fraction * self.counts[index], 1)
+
+
+def _path_indices(rng, n_paths, n_periods, history, block_size):
+    """Resampled history indices shaped (n_paths, n_periods); blocks keep autocorrelation."""
+    if block_size <= 1:
+        return rng.integers(0, history, size=(n_paths, n_periods))
+    n_blocks = -(-n_periods // block_size)
+    starts = rng.integers(0, history - block_size + 1, size=(n_paths, n_blocks))
+    indices = starts[..., None] + np.arange(block_size)
+    return indices.reshape(n_paths, -1)[:, :n_periods]
+
+
+def simulate_chunk(log_returns, n_paths, n_periods, ruin_level, block_size, seed, bins):
+    """
+    Simulate one chunk of equity paths by resampling historical log returns.
+
+    Parameters:
+    - log_returns (np.ndarray): Historical per-period log returns of one series.
+    - n_paths (int): Paths in the chunk.
+    - n_periods (int): Periods per path.
+    - ruin_level (float): Fraction of the starting equity that counts as ruin.
+    - block_size (int): Length of resampled blocks; 1 is i.i.d. resampling.
+    - seed (np.random.SeedSequence): Seed of the chunk.
+    - bins (tuple): (low, high, n_bins) of the QuantileHistogram.
+
+    Returns:
+    - tuple: (QuantileHistogram of terminal log growths, number of ruined paths).
+    """
+    rng = np.random.default_rng(seed)
+    indices = _path_indices(rng, n_paths, n_periods, len(log_returns), block_size)
+    paths = np.cumsum(log_returns[indices], axis=1)
+    histogram = QuantileHistogram(*bins)
+    histogram.update(paths[:, -1])
+    ruined = int(np.count_nonzero(paths.min(axis=1) <= np.log(ruin_level)))
+    return histogram, ruined
+
+
+def _chunk_job(args):
+    series, log_returns, n_paths, options, seed = args
+    return series, simulate_chunk(log_returns, n_paths, seed=seed, **options)
+
+
+def monte_carlo_frame(
+    returns,
+    models,
+    stocks,
+    n_paths=100_000,
+    n_periods=None,
+    chunk_size=10_000,
+    confidence=0.95,
+    ruin_level=0.5,
+    block_size=1,
+    bins=(-10.0, 10.0, 20_000),
+    max_workers=None,
+    seed=None,
+):
+    """
+    Monte Carlo VaR, CVaR and probability of ruin for every (model, stock) series.
+
+    Paths are generated chunk_size at a time and reduced to a QuantileHistogram and a
+    ruin count before the next chunk is drawn, so peak memory is about
+    chunk_size x n_periods values per worker whatever n_paths is. Chunks of all series
+    are spread over one process pool and merged as they arrive.
+
+    Parameters:
+    - returns (array-like): Historical strategy returns shaped (n_models, n_stocks, n_periods).
+    - models (list): Model names, one per first axis entry.
+    - stocks (list): Stock names, one per second axis entry.
+    - n_paths (int): Simulated paths per series.
+    - n_periods (int, optional): Periods per path (defaults to the history length).
+    - chunk_size (int): Paths simulated per chunk.
+    - confidence (float): Confidence level of VaR/CVaR (e.g., 0.95).
+    - ruin_level (float): Equity, as a fraction of the start, that counts as ruin.
+    - block_size (int): Length of resampled blocks; 1 is i.i.d. resampling.
+    - bins (tuple): (low, high, n_bins) of the terminal log-growth histograms.
+    - max_workers (int, optional): Worker processes; 1 runs in the current process.
+    - seed (int, optional): Root seed; every chunk gets an independent child seed.
+
+    Returns:
+    - pd.DataFrame: One row per (model, stock) with 'Model', 'Stock', 'VaR', 'CVaR'
+      (losses over the path horizon, positive numbers) and 'Probability_of_Ruin'.
+    """
+    log_returns = np.log1p(np.asarray(returns, dtype=np.float64))
+    n_models, n_stocks, history = log_returns.shape
+    options = {
+        "n_periods": history if n_periods is None else n_periods,
+        "ruin_level": ruin_level,
+        "block_size": block_size,
+        "bins": bins,
+    }
+    sizes = [
+        min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)
+    ]
+    n_series = n_models * n_stocks
+    seeds = iter(np.random.SeedSequence(seed).spawn(n_series * len(sizes)))
+    jobs = (
+        (
+            series,
+            log_returns[series // n_stocks, series % n_stocks],
+            size,
+            options,
+            next(seeds),
+        )
+        for series in range(n_series)
+        for size in sizes
+    )
+
+    histograms = [QuantileHistogram(*bins) for _ in range(n_series)]
+    ruined = np.zeros(n_series, dtype=np.int64)
+    if max_workers == 1:
+        partials = map(_chunk_job, jobs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        partials = executor.map(_chunk_job, jobs, chunksize=4)
+    try:
+        for series, (histogram, count) in partials:
+            histograms[series].merge(histogram)
+            ruined[series] += count
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    tail = 1.0 - confidence
+    return pd.DataFrame(
+        {
+            "Model": np.repeat(np.asarray(models, dtype=object), n_stocks),
+            "Stock": np.tile(np.asarray(stocks, dtype=object), n_models),
+            "VaR": [-np.expm1(h.quantile(tail)) for h in histograms],
+            "CVaR": [-h.tail_mean(tail) for h in histograms],
+            "Probability_of_Ruin": ruined / n_paths,
+        }
+    )
+
+
+# Example usage: 200,000 paths per series for two models on synthetic data
+if __name__ == "__main__":
+    from backtest import bar_returns, positions_from_signals
+
+    rng = np.random.default_rng(18)
+    models = ["MFA_Multi_indicator", "Attention_CNN_BiLSTM_Multi_Indicator"]
+    stocks = [f"STOCK{i:02d}" for i in range(6)]
+    prices = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0004, 0.02, (len(stocks), 504)), axis=1)
+    )
+    signals = rng.random((len(models), len(stocks), 504)) > [[[0.4]], [[0.6]]]
+    strategy = positions_from_signals(signals) * bar_returns(prices)
+
+    start = time.perf_counter()
+    risk = monte_carlo_frame(strategy, models, stocks, n_paths=200_000, seed=1)
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {len(risk)} series x 200,000 paths in {elapsed:.2f}s")
+    print(risk)
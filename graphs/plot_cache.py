@@ -0,0 +1,136 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+# Bump when the cache layout changes; drawing code changes are caught by source_digest
+RENDER_VERSION = 3
+
+
+def source_digest(*objects):
+    """
+    Hash the source code of modules or functions.
+
+    Passed to PlotCache.key with the chart parameters, so editing the drawing code
+    invalidates the images it rendered before.
+
+    Returns:
+    - str: Hex digest of the combined source.
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()[:16]
+
+
+class PlotCache:
+    """
+    Content-addressed on-disk cache of rendered chart files.
+
+    Images are stored under a hash of the plotted rows and the chart parameters, so an
+    unchanged chart costs one hash of its data instead of a render. The least recently
+    used images are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, df, **params):
+        """
+        Hash the rows of a DataFrame together with the chart parameters.
+
+        Parameters:
+        - df (pd.DataFrame): The exact rows that will be plotted.
+        - **params: JSON-serializable chart parameters (metric, stocks, cost, ...).
+
+        Returns:
+        - str: Hex digest identifying the chart.
+        """
+        digest = hashlib.sha256()
+        header = {
+            "version": RENDER_VERSION,
+            "columns": [str(c) for c in df.columns],
+            "dtypes": [str(t) for t in df.dtypes],
+            "params": params,
+        }
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key, fmt):
+        return os.path.join(self.directory, f"{key}.{fmt}")
+
+    def get(self, key, fmt):
+        """
+        Look up a cached image.
+
+        Parameters:
+        - key (str): Chart key from key().
+        - fmt (str): File format (e.g., 'png').
+
+        Returns:
+        - str or None: Path of the cached file, or None on a miss.
+        """
+        path = self._path(key, fmt)
+        try:
+            # Touch the file so eviction sees it as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, fmt, source_path):
+        """
+        Store a copy of a rendered image and evict old entries if needed.
+
+        Parameters:
+        - key (str): Chart key from key().
+        - fmt (str): File format (e.g., 'png').
+        - source_path (str): Rendered file to copy into the cache.
+
+        Returns:
+        - str: Path of the cached copy.
+        """
+        path = self._path(key, fmt)
+        # Copy to a temporary name first so readers never see a half-written image
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def size(self):
+        """Total size of the cached images in bytes."""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        ]
+
+    def evict(self):
+        """Delete least recently used images until the cache fits in max_bytes."""
+        entries = [(entry.stat(), entry.path) for entry in self._entries()]
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda item: item[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= stat.st_size
+
+    def clear(self):
+        """Remove every cached image."""
+        for entry in self._entries():
+            os.remove(entry.path)
@@ -0,0 +1,233 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import (
+    INITIAL_CAPITAL,
+    METRIC_COLUMNS,
+    TRADING_DAYS_PER_YEAR,
+    count_trades,
+    equity_curve,
+    positions_from_signals,
+)
+from indicators import rolling_std
+
+ALLOCATIONS = ("equal", "volatility")
+
+# Stock label of portfolio rows in the graphs DataFrame
+PORTFOLIO_LABEL = "Portfolio"
+
+
+def rebalance_points(n_bars, every=None):
+    """
+    Bars at which the portfolio is (re)allocated.
+
+    Parameters:
+    - n_bars (int): Length of the history.
+    - every (int, optional): Bars between rebalances; None allocates once at the start.
+
+    Returns:
+    - np.ndarray: Sorted bar indices, starting with 0.
+    """
+    if every is None:
+        return np.array([0])
+    if every < 1:
+        raise ValueError("every must be a positive number of bars")
+    return np.arange(0, max(n_bars - 1, 1), every)
+
+
+def allocation_weights(
+    prices, points, allocation="equal", vol_window=63, max_weight=None
+):
+    """
+    Target weights of every stock at every rebalance point.
+
+    Parameters:
+    - prices (np.ndarray): Close prices shaped (n_stocks, n_bars); stocks not yet listed
+      (NaN) at a rebalance get no weight until the next one, so with a single
+      allocation stocks listing later never get any capital.
+    - points (np.ndarray): Rebalance bars from rebalance_points.
+    - allocation (str): 'equal', or 'volatility' for weights proportional to the inverse
+      of each stock's trailing return volatility (equal until vol_window bars exist).
+    - vol_window (int): Trailing bars used to measure volatility.
+    - max_weight (float, optional): Cap on any single weight before renormalizing.
+
+    Returns:
+    - np.ndarray: Weights shaped (n_points, n_stocks); each row sums to 1, or to 0 at a
+      rebalance where no stock is listed (the pool is then held as cash).
+    """
+    if allocation not in ALLOCATIONS:
+        raise ValueError(f"allocation must be one of {ALLOCATIONS}")
+    listed = ~np.isnan(prices[:, points]).T
+    raw = listed.astype(np.float64)
+    if allocation == "volatility":
+        returns = prices[:, 1:] / prices[:, :-1] - 1.0
+        vol = rolling_std(returns, vol_window)
+        # Volatility known at bar r uses the returns up to r - 1
+        known = vol[:, np.maximum(points - 1, 0)].T
+        known[points == 0] = np.nan
+        with np.errstate(divide="ignore"):
+            inverse = np.where(listed, 1.0 / known, 0.0)
+        usable = np.all(np.isfinite(inverse) & (inverse >= 0), axis=1)
+        raw = np.where(usable[:, None], inverse, raw)
+    weights = raw / np.maximum(raw.sum(axis=1, keepdims=True), 1e-300)
+    if max_weight is not None:
+        weights = np.minimum(weights, max_weight)
+        weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-300)
+    return weights
+
+
+def simulate_portfolio(
+    prices,
+    signals=None,
+    allocation="equal",
+    rebalance=21,
+    vol_window=63,
+    max_weight=None,
+    cost=0.0,
+    initial_capital=INITIAL_CAPITAL,
+    periods_per_year=TRADING_DAYS_PER_YEAR,
+):
+    """
+    Simulate one capital pool allocated across all stocks.
+
+    Each stock's sleeve follows its long/flat strategy between rebalances. Instead of
+    stepping through time, every bar is mapped to the rebalance that precedes it and
+    each sleeve's growth since that rebalance is one gather of the cumulative growth
+    matrix, so the whole (stocks x time) grid is evaluated with array operations:
+
+        value[t] = value[r] * sum_s weight[r, s] * growth[s, t] / growth[s, r]
+
+    At each rebalance the drifted weights are traded back to target, paying cost on
+    the turnover; entries of the strategies pay cost as in backtest.run_backtest. The
+    pool is held as cash until the first bar at which any stock is listed, and is
+    allocated from there.
+
+    Parameters:
+    - prices (array-like): Close prices shaped (n_stocks, n_bars); shorter histories are
+      NaN-padded at the start.
+    - signals (array-like, optional): Model signals shaped (..., n_stocks, n_bars) with
+      values > 0 meaning "long"; None holds every stock (buy and hold).
+    - allocation (str): 'equal' or 'volatility' (see allocation_weights).
+    - rebalance (int, optional): Bars between rebalances; None allocates once and never
+      rebalances, so stocks listing after that allocation never get any capital.
+    - vol_window (int): Trailing bars used by volatility scaling.
+    - max_weight (float, optional): Cap on any single weight.
+    - cost (float): Proportional cost per trade and per unit of rebalance turnover.
+    - initial_capital (float): Capital of the whole pool.
+    - periods_per_year (int): Bars per year, used to annualize CAGR.
+
+    Returns:
+    - dict: 'ROI', 'CAGR', 'Final_Capital', 'Number_of_Trades' and 'Turnover' arrays
+      shaped (...), 'Equity' shaped (..., n_bars) and 'Weights' shaped
+      (n_rebalances, n_stocks) (with a leading all-cash row of zeros when no stock is
+      listed at bar 0).
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    n_stocks, n_bars = prices.shape
+    if n_bars < 2:
+        raise ValueError("At least two bars are needed to simulate a portfolio")
+    # Before listing a stock's price stays at its first quote, i.e. a flat sleeve
+    first = np.argmax(~np.isnan(prices), axis=1)
+    filled = np.where(
+        np.isnan(prices), prices[np.arange(n_stocks), first][:, None], prices
+    )
+    listed = np.arange(n_bars) >= first[:, None]
+    signals = listed if signals is None else (np.asarray(signals) > 0) & listed
+
+    # Allocate from the first bar where any stock is listed, holding cash until then
+    start = int(first.min())
+    if np.isnan(prices[:, start]).all():
+        raise ValueError("No stock has any price")
+    if start >= n_bars - 1:
+        start = 0
+    points = start + rebalance_points(n_bars - start, rebalance)
+    if start > 0:
+        points = np.concatenate([[0], points])
+    weights = allocation_weights(prices, points, allocation, vol_window, max_weight)
+    # Capital not allocated to any stock (nothing listed yet) stays as cash
+    cash = 1.0 - weights.sum(axis=1)
+    growth = equity_curve(filled, signals, 1.0, cost)
+
+    # Segment of every bar t >= 1: the last rebalance strictly before t
+    bars = np.arange(1, n_bars)
+    segment = np.searchsorted(points, bars, side="left") - 1
+    relative = growth[..., bars] / growth[..., points[segment]]
+    sleeve = weights[segment].T * relative
+    value = sleeve.sum(axis=-2) + cash[segment]
+
+    # Value of the pool at each rebalance, net of the turnover paid there
+    ends = np.append(points[1:], n_bars - 1)
+    end_value = value[..., ends - 1]
+    drifted = sleeve[..., ends[:-1] - 1] / end_value[..., None, :-1]
+    # Stocks bought out of cash pay their entry cost in the strategies, as at bar 0
+    drifted_cash = cash[:-1] / end_value[..., :-1]
+    turnover = np.maximum(
+        np.abs(weights[1:].T - drifted).sum(axis=-2) - np.abs(cash[1:] - drifted_cash),
+        0.0,
+    )
+    step = end_value[..., :-1] * (1.0 - cost * turnover)
+    start_value = np.concatenate(
+        [np.ones(step.shape[:-1] + (1,)), np.cumprod(step, axis=-1)], axis=-1
+    )
+
+    equity = np.empty(value.shape[:-1] + (n_bars,))
+    equity[..., 0] = 1.0
+    equity[..., 1:] = start_value[..., segment] * value
+    equity *= initial_capital
+
+    total = equity[..., -1] / initial_capital
+    years = (n_bars - 1) / periods_per_year
+    trades = count_trades(positions_from_signals(signals))
+    return {
+        "ROI": total - 1.0,
+        "CAGR": total ** (1.0 / years) - 1.0,
+        "Final_Capital": equity[..., -1],
+        "Number_of_Trades": trades.sum(axis=-1),
+        "Turnover": turnover.sum(axis=-1),
+        "Equity": equity,
+        "Weights": weights,
+    }
+
+
+def portfolio_frame(results, models):
+    """
+    Portfolio results in the graphs DataFrame layout, with Stock set to 'Portfolio'.
+
+    Parameters:
+    - results (dict): Output of simulate_portfolio with signals shaped (n_models, ...).
+    - models (list): Model names, one per leading entry.
+
+    Returns:
+    - pd.DataFrame: One row per model with 'Model', 'Stock' and the portfolio metrics.
+    """
+    frame = pd.DataFrame({"Model": list(models), "Stock": PORTFOLIO_LABEL})
+    for column in METRIC_COLUMNS + ["Turnover"]:
+        if column in results:
+            frame[column] = np.broadcast_to(results[column], (len(models),))
+    return frame
+
+
+# Example usage: equal vs. volatility-scaled allocation of one pool across 500 stocks
+if __name__ == "__main__":
+    rng = np.random.default_rng(17)
+    n_stocks, n_bars = 500, 2520
+    vols = rng.uniform(0.01, 0.04, (n_stocks, 1))
+    prices = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0003, 1.0, (n_stocks, n_bars)) * vols, axis=1)
+    )
+    prices[::9, : n_bars // 3] = np.nan
+    signals = rng.random((3, n_stocks, n_bars)) > [[[0.3]], [[0.5]], [[0.7]]]
+    models = ["Long_70%", "Long_50%", "Long_30%"]
+
+    for allocation in ALLOCATIONS:
+        start = time.perf_counter()
+        results = simulate_portfolio(
+            prices, signals, allocation=allocation, rebalance=21, cost=0.003
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"{allocation}: 3 models x {n_stocks} stocks x {n_bars} bars in {elapsed:.2f}s"
+        )
+        print(portfolio_frame(results, models))
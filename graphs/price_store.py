@@ -0,0 +1,227 @@
+import json
+import os
+import time
+
+import numpy as np
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+_TICKERS_FILE = "tickers.json"
+_DATES_FILE = "dates.npy"
+
+
+class PriceStore:
+    """
+    On-disk columnar OHLCV store: one memory-mapped (tickers x dates) array per field.
+
+    Each ticker's history is contiguous in every field file, so slicing one ticker (or a
+    run of adjacent tickers) over a date range returns a zero-copy view. Every process
+    that opens the same directory maps the same files, so the OS shares the pages between
+    worker processes instead of each one loading its own copy.
+    """
+
+    def __init__(self, directory, mode="r"):
+        """
+        Open an existing store.
+
+        Parameters:
+        - directory (str): Directory created by PriceStore.create or PriceStore.from_arrays.
+        - mode (str): 'r' for read-only views, 'r+' to allow writes.
+        """
+        self.directory = directory
+        self.mode = mode
+        with open(os.path.join(directory, _TICKERS_FILE)) as fh:
+            self.tickers = json.load(fh)
+        self.dates = np.load(os.path.join(directory, _DATES_FILE))
+        self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._arrays = {}
+
+    def __reduce__(self):
+        # Pickle as the directory only; the receiving process maps the files itself
+        return (PriceStore, (self.directory, self.mode))
+
+    @classmethod
+    def create(cls, directory, tickers, dates, fields=FIELDS, dtype=np.float64):
+        """
+        Create an empty (NaN-filled, or zero-filled for integer dtypes) store to be written field by field.
+
+        Parameters:
+        - directory (str): Directory to create the store in.
+        - tickers (list): Ticker names, in storage order.
+        - dates (array-like): Sorted bar dates (anything np.datetime64 accepts).
+        - fields (tuple): Field names to allocate.
+        - dtype (np.dtype): Storage dtype of every field.
+
+        Returns:
+        - PriceStore: The new store opened in 'r+' mode.
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        if np.any(dates[1:] <= dates[:-1]):
+            raise ValueError("dates must be strictly increasing")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, _TICKERS_FILE), "w") as fh:
+            json.dump(list(tickers), fh)
+        np.save(os.path.join(directory, _DATES_FILE), dates)
+        for field in fields:
+            array = np.lib.format.open_memmap(
+                os.path.join(directory, f"{field}.npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=(len(tickers), len(dates)),
+            )
+            array[:] = np.nan if np.issubdtype(array.dtype, np.floating) else 0
+            array.flush()
+            del array
+        return cls(directory, mode="r+")
+
+    @classmethod
+    def from_arrays(cls, directory, tickers, dates, arrays, dtype=np.float64):
+        """
+        Create a store from in-memory (tickers x dates) arrays.
+
+        Parameters:
+        - directory (str): Directory to create the store in.
+        - tickers (list): Ticker names, one per array row.
+        - dates (array-like): Sorted bar dates, one per array column.
+        - arrays (dict): Maps field name to an array shaped (len(tickers), len(dates)).
+        - dtype (np.dtype): Storage dtype of every field.
+
+        Returns:
+        - PriceStore: The new store opened read-only.
+        """
+        store = cls.create(directory, tickers, dates, tuple(arrays), dtype)
+        for field, values in arrays.items():
+            store.field(field)[:] = values
+        store.flush()
+        return cls(directory)
+
+    @property
+    def fields(self):
+        """Names of the fields stored in the directory."""
+        return sorted(
+            name[: -len(".npy")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".npy") and name != _DATES_FILE
+        )
+
+    def field(self, name):
+        """
+        Memory-mapped (tickers x dates) array of one field.
+
+        Parameters:
+        - name (str): Field name (e.g., 'close').
+
+        Returns:
+        - np.memmap: The whole field; nothing is read until it is sliced.
+        """
+        array = self._arrays.get(name)
+        if array is None:
+            path = os.path.join(self.directory, f"{name}.npy")
+            array = np.load(path, mmap_mode=self.mode)
+            self._arrays[name] = array
+        return array
+
+    def date_slice(self, start=None, end=None):
+        """
+        Column slice covering the dates in [start, end].
+
+        Parameters:
+        - start (str or np.datetime64, optional): First date to include.
+        - end (str or np.datetime64, optional): Last date to include.
+
+        Returns:
+        - slice: Slice into the date axis.
+        """
+        first = (
+            0
+            if start is None
+            else np.searchsorted(self.dates, np.datetime64(start, "D"))
+        )
+        last = (
+            len(self.dates)
+            if end is None
+            else np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+        )
+        return slice(int(first), int(last))
+
+    def ticker_rows(self, tickers):
+        """
+        Row selector for tickers: a slice when they are adjacent in storage, else indices.
+
+        Parameters:
+        - tickers (str or list, optional): One ticker, several tickers, or None for all.
+
+        Returns:
+        - int, slice or np.ndarray: Selector into the ticker axis.
+        """
+        if tickers is None:
+            return slice(None)
+        if isinstance(tickers, str):
+            return self._positions[tickers]
+        rows = np.array([self._positions[ticker] for ticker in tickers], dtype=np.intp)
+        if len(rows) and np.all(np.diff(rows) == 1):
+            return slice(int(rows[0]), int(rows[-1]) + 1)
+        return rows
+
+    def window(self, field, tickers=None, start=None, end=None):
+        """
+        Prices of some tickers over a date range.
+
+        The result is a zero-copy view of the mapped file when tickers is a single ticker,
+        None, or a run of tickers adjacent in storage; other ticker lists need a gather and
+        return a copy.
+
+        Parameters:
+        - field (str): Field name (e.g., 'close').
+        - tickers (str or list, optional): Ticker(s) to select; None selects all.
+        - start (str or np.datetime64, optional): First date to include.
+        - end (str or np.datetime64, optional): Last date to include.
+
+        Returns:
+        - np.ndarray: Shaped (n_dates,) for one ticker, else (n_tickers, n_dates).
+        """
+        return self.field(field)[self.ticker_rows(tickers), self.date_slice(start, end)]
+
+    def flush(self):
+        """Write pending changes of writable fields to disk."""
+        for array in self._arrays.values():
+            if isinstance(array, np.memmap) and self.mode != "r":
+                array.flush()
+
+
+def _buy_and_hold_roi(store, ticker):
+    """Example worker: reads its ticker straight from the shared mapping."""
+    from backtest import buy_and_hold
+
+    prices = store.window("close", ticker, "2018-01-01", "2020-12-31")
+    return ticker, float(buy_and_hold(prices)["ROI"])
+
+
+# Example usage: build a store, then slice it zero-copy from several processes
+if __name__ == "__main__":
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    rng = np.random.default_rng(9)
+    n_tickers, n_dates = 500, 2520
+    tickers = [f"STOCK{i:03d}" for i in range(n_tickers)]
+    dates = np.datetime64("2015-01-01") + np.arange(n_dates)
+    close = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0003, 0.02, (n_tickers, n_dates)), axis=1)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        store = PriceStore.from_arrays(tmp, tickers, dates, {"close": close})
+        print(
+            f"Wrote {store.fields} for {n_tickers} tickers in {time.perf_counter() - start:.2f}s"
+        )
+
+        view = store.window("close", tickers[10:20], "2018-01-01", "2018-12-31")
+        print(
+            f"Window {view.shape} shares the file mapping: {np.shares_memory(view, store.field('close'))}"
+        )
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(_buy_and_hold_roi, [store] * 4, tickers[:4]))
+        print(results)
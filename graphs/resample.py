@@ -0,0 +1,203 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# Fields of every bar, matching price_store.FIELDS plus the tick count
+BAR_FIELDS = ("open", "high", "low", "close", "volume", "ticks")
+
+# Most bars ticks_to_bars creates with keep_empty, which also emits bars without ticks
+MAX_EMPTY_BARS = 10_000_000
+
+
+def _nanoseconds(values):
+    """Datetimes (or integer nanoseconds) as int64 nanoseconds since the epoch."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").view(np.int64)
+    return values.astype(np.int64)
+
+
+def _interval_ns(interval):
+    if isinstance(interval, str):
+        interval = pd.Timedelta(interval).to_timedelta64()
+    if isinstance(interval, np.timedelta64):
+        return int(interval.astype("timedelta64[ns]").view(np.int64))
+    return int(interval)
+
+
+def ticks_to_bars(
+    times, prices, volumes=None, interval="1D", origin=0, keep_empty=False
+):
+    """
+    Resample sorted ticks into OHLCV bars.
+
+    Every tick gets the integer bin (time - origin) // interval; the positions where the
+    sorted bins change give the first tick of every bar, and the highs, lows and volumes
+    are single np.maximum / np.minimum / np.add.reduceat calls over them. Only bins with
+    ticks are materialized unless keep_empty asks for the empty ones in between.
+
+    Parameters:
+    - times (array-like): Tick times, non-decreasing (datetime64 or int nanoseconds).
+    - prices (array-like): Tick prices.
+    - volumes (array-like, optional): Tick volumes (default: 0).
+    - interval (str, np.timedelta64 or int): Bar length, e.g. '1D', '5min' or nanoseconds.
+    - origin (datetime64 or int): Time at which bars are aligned (default: the epoch).
+    - keep_empty (bool): Also emit bars without ticks (OHLC NaN, volume 0); raises
+      ValueError beyond MAX_EMPTY_BARS bars.
+
+    Returns:
+    - dict: 'time' (bar start, datetime64[ns]) and BAR_FIELDS arrays, one entry per bar.
+    """
+    ns = _nanoseconds(times)
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = (
+        np.zeros(len(prices)) if volumes is None else np.asarray(volumes, np.float64)
+    )
+    step = _interval_ns(interval)
+    offset = int(_nanoseconds(origin))
+    if len(ns) == 0:
+        return _no_bars()
+    if np.any(ns[1:] < ns[:-1]):
+        raise ValueError("Tick times must be sorted")
+
+    bins = (ns - offset) // step
+    if keep_empty:
+        n_bars = int(bins[-1] - bins[0]) + 1
+        if n_bars > MAX_EMPTY_BARS:
+            raise ValueError(
+                f"keep_empty would create {n_bars:,} bars (limit {MAX_EMPTY_BARS:,})"
+            )
+        labels = np.arange(bins[0], bins[-1] + 1)
+        edges = np.searchsorted(bins, labels)
+    else:
+        # Only the bins that have ticks, however far apart they are
+        edges = np.r_[0, np.flatnonzero(np.diff(bins)) + 1]
+        labels = bins[edges]
+    ticks = np.diff(np.append(edges, len(bins)))
+
+    filled = ticks > 0
+    starts = edges[filled]
+    bars = _empty_fields(len(labels))
+    bars["open"][filled] = prices[starts]
+    bars["close"][filled] = prices[starts + ticks[filled] - 1]
+    bars["high"][filled] = np.maximum.reduceat(prices, starts)
+    bars["low"][filled] = np.minimum.reduceat(prices, starts)
+    bars["volume"][filled] = np.add.reduceat(volumes, starts)
+    bars["ticks"][:] = ticks
+    times = (labels * step + offset).view("datetime64[ns]")
+    return {"time": times, **bars}
+
+
+def _empty_fields(n):
+    bars = {field: np.full(n, np.nan) for field in ("open", "high", "low", "close")}
+    bars["volume"] = np.zeros(n)
+    bars["ticks"] = np.zeros(n, dtype=np.int64)
+    return bars
+
+
+def _no_bars():
+    return {"time": np.array([], dtype="datetime64[ns]"), **_empty_fields(0)}
+
+
+def _concat(parts):
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+class TickResampler:
+    """
+    Streams chunks of ticks into bars.
+
+    Every chunk is resampled with ticks_to_bars; the last bar of a chunk may still get
+    ticks from the next one, so it is held back as a one-bar carry and merged with the
+    next chunk's first bar when they share a bin. Memory is one chunk plus one bar.
+    """
+
+    def __init__(self, interval="1D", origin=0):
+        """
+        Parameters:
+        - interval (str, np.timedelta64 or int): Bar length, e.g. '1D' or '5min'.
+        - origin (datetime64 or int): Time at which bars are aligned.
+        """
+        self.interval = interval
+        self.origin = origin
+        self._carry = None
+
+    def push(self, times, prices, volumes=None):
+        """
+        Add a chunk of ticks, later than every tick pushed before.
+
+        Parameters:
+        - times (array-like): Tick times, non-decreasing.
+        - prices (array-like): Tick prices.
+        - volumes (array-like, optional): Tick volumes.
+
+        Returns:
+        - dict: The bars completed by this chunk (possibly none), as from ticks_to_bars.
+        """
+        bars = ticks_to_bars(times, prices, volumes, self.interval, self.origin)
+        if len(bars["time"]) == 0:
+            return _no_bars()
+        carry = self._carry
+        if carry is not None:
+            if bars["time"][0] < carry["time"][0]:
+                raise ValueError("Chunks must arrive in time order")
+            if bars["time"][0] == carry["time"][0]:
+                bars["open"][0] = carry["open"][0]
+                bars["high"][0] = max(bars["high"][0], carry["high"][0])
+                bars["low"][0] = min(bars["low"][0], carry["low"][0])
+                bars["volume"][0] += carry["volume"][0]
+                bars["ticks"][0] += carry["ticks"][0]
+                carry = None
+        self._carry = {key: values[-1:] for key, values in bars.items()}
+        done = {key: values[:-1] for key, values in bars.items()}
+        return done if carry is None else _concat([carry, done])
+
+    def flush(self):
+        """
+        Emit the bar still held back.
+
+        Returns:
+        - dict: The last bar (or no bars when nothing is pending).
+        """
+        carry, self._carry = self._carry, None
+        return _no_bars() if carry is None else carry
+
+
+def bars_frame(bars):
+    """Bars as a DataFrame indexed by bar start time."""
+    return pd.DataFrame(
+        {field: bars[field] for field in BAR_FIELDS}, index=bars["time"]
+    )
+
+
+# Example usage: stream synthetic ticks of one trading year into daily and 5-minute bars
+if __name__ == "__main__":
+    rng = np.random.default_rng(20)
+    n_ticks = 20_000_000
+    start_ns = np.datetime64("2024-01-01").astype("datetime64[ns]").view(np.int64)
+    gaps = rng.exponential(365 * 86_400e9 / n_ticks, n_ticks).astype(np.int64)
+    times = (start_ns + np.cumsum(gaps)).view("datetime64[ns]")
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 1e-4, n_ticks)))
+    volumes = rng.integers(1, 500, n_ticks).astype(np.float64)
+
+    for interval in ["1D", "5min"]:
+        resampler = TickResampler(interval)
+        parts = []
+        start = time.perf_counter()
+        for first in range(0, n_ticks, 1_000_000):
+            chunk = slice(first, first + 1_000_000)
+            parts.append(resampler.push(times[chunk], prices[chunk], volumes[chunk]))
+        parts.append(resampler.flush())
+        bars = _concat(parts)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{interval}: {len(bars['time'])} bars from {n_ticks:,} ticks in {elapsed:.2f}s "
+            f"({n_ticks / elapsed / 1e6:.1f}M ticks/s)"
+        )
+    whole = ticks_to_bars(times, prices, volumes, "5min")
+    print(
+        "Streaming matches one-shot:",
+        all(np.array_equal(whole[k], bars[k]) for k in whole),
+    )
+    print(bars_frame(bars).head())
@@ -0,0 +1,291 @@
+import os
+import struct
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# Label columns stored as categoricals; numeric columns are float32 metrics and any other
+# column (e.g., 'Notes' or 'Date') is kept as a categorical of its text
+CATEGORY_COLUMNS = ["Model", "Stock"]
+METRIC_DTYPE = np.float32
+
+# NPZ files keep categoricals as integer codes plus the category labels
+CODES_SUFFIX = "__codes"
+CATEGORIES_SUFFIX = "__categories"
+
+
+def _labels(series):
+    """Distinct labels of a column, keeping existing categories or order of appearance."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories
+    return pd.unique(series.dropna())
+
+
+def _as_category(series):
+    """A column as a categorical whose categories follow _labels, not sorted order."""
+    return series.astype(pd.CategoricalDtype(_labels(series)))
+
+
+def _is_metric(series):
+    """Whether a non-label column holds numbers (stored as float32) rather than text."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    return pd.api.types.is_numeric_dtype(series.dtype)
+
+
+def _metric_or_text(series):
+    """A non-label column as float32 when it parses as numbers, else as a categorical."""
+    if pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(
+        series.dtype
+    ):
+        try:
+            series = pd.to_numeric(series)
+        except (ValueError, TypeError):
+            pass
+    if _is_metric(series):
+        return series.astype(METRIC_DTYPE)
+    return _as_category(series)
+
+
+def optimize_results_frame(df, categories=None):
+    """
+    Convert a results DataFrame to categorical label columns and float32 metric columns.
+
+    Other non-numeric columns become categoricals too.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics.
+    - categories (dict, optional): Maps a label column to its full list of categories, so
+      frames loaded separately share the same codes. Otherwise labels keep their order of
+      appearance, which is the order the charts draw them in.
+
+    Returns:
+    - pd.DataFrame: Converted copy of df.
+    """
+    categories = categories or {}
+    columns = {}
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS or column in categories:
+            columns[column] = (
+                df[column].astype(pd.CategoricalDtype(categories[column]))
+                if column in categories
+                else _as_category(df[column])
+            )
+        else:
+            columns[column] = _metric_or_text(df[column])
+    return pd.DataFrame(columns, index=df.index)
+
+
+def save_results(df, path):
+    """
+    Write a results DataFrame to a '.csv' or '.npz' file.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics.
+    - path (str): Destination file; the extension selects the format.
+    """
+    if path.endswith(".csv"):
+        df.to_csv(path, index=False)
+        return
+    if not path.endswith(".npz"):
+        raise ValueError(f"Unsupported results format: {path}")
+
+    arrays = {}
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS or not _is_metric(df[column]):
+            values = _as_category(df[column])
+            arrays[column + CODES_SUFFIX] = values.cat.codes.to_numpy(np.int32)
+            arrays[column + CATEGORIES_SUFFIX] = values.cat.categories.to_numpy(str)
+        else:
+            arrays[column] = df[column].to_numpy(METRIC_DTYPE)
+    np.savez(path, **arrays)
+
+
+def _open_npz(path):
+    """
+    Memory-map every array of an uncompressed NPZ archive without reading it.
+
+    np.savez stores the '.npy' members uncompressed, so each array's data sits contiguously
+    in the file and can be mapped at its offset; slicing a chunk then only touches the
+    pages of that chunk. Archives with compressed members (np.savez_compressed) can't be
+    mapped and are read whole with np.load instead.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as fh:
+        infos = archive.infolist()
+        if any(info.compress_type != zipfile.ZIP_STORED for info in infos):
+            with np.load(path) as npz:
+                return {name: npz[name] for name in npz.files}
+        for info in infos:
+            # Skip the zip local file header to reach the '.npy' payload
+            fh.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", fh.read(4))
+            fh.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+            name = info.filename[: -len(".npy")]
+            if np.prod(shape) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=fh.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+def _npz_columns(arrays):
+    """Column names stored in an NPZ results archive, in file order."""
+    columns = []
+    for key in arrays:
+        if key.endswith(CATEGORIES_SUFFIX):
+            continue
+        columns.append(key[: -len(CODES_SUFFIX)] if key.endswith(CODES_SUFFIX) else key)
+    return columns
+
+
+def _npz_frame(arrays, start=None, stop=None):
+    """Build a frame from rows [start, stop) of a mapped NPZ results archive."""
+    columns = {}
+    for column in _npz_columns(arrays):
+        if column + CODES_SUFFIX in arrays:
+            codes = np.array(arrays[column + CODES_SUFFIX][start:stop])
+            labels = np.asarray(arrays[column + CATEGORIES_SUFFIX])
+            columns[column] = pd.Categorical.from_codes(codes, categories=labels)
+        else:
+            columns[column] = np.array(arrays[column][start:stop], dtype=METRIC_DTYPE)
+    return pd.DataFrame(columns)
+
+
+def _csv_dtypes(path, categories):
+    """
+    Per-column dtypes for reading a results CSV with fixed categories.
+
+    Columns without a fixed dtype are parsed by pandas and converted by _csv_chunk.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [c for c in CATEGORY_COLUMNS if c in header and c not in categories]
+    if missing:
+        # One cheap pass over just the label columns gives every chunk the same codes
+        labels = pd.read_csv(path, usecols=missing)
+        categories = {**categories, **{c: _labels(labels[c]) for c in missing}}
+    return {
+        column: pd.CategoricalDtype(categories[column])
+        for column in header
+        if column in CATEGORY_COLUMNS or column in categories
+    }
+
+
+def _csv_chunk(df, dtypes):
+    """Float32 metrics and categorical text for the columns parsed without a dtype."""
+    for column in df.columns:
+        if column not in dtypes:
+            df[column] = _metric_or_text(df[column])
+    return df
+
+
+def load_results(path, categories=None):
+    """
+    Load a results file into a DataFrame with categorical labels and float32 metrics.
+
+    Parameters:
+    - path (str): '.csv' or '.npz' file written by save_results (or by hand for CSV).
+    - categories (dict, optional): Maps a label column to its full list of categories.
+
+    Returns:
+    - pd.DataFrame: Results with columns 'Model', 'Stock', and the metrics.
+    """
+    if path.endswith(".npz"):
+        df = _npz_frame(_open_npz(path))
+        return optimize_results_frame(df, categories) if categories else df
+    if path.endswith(".csv"):
+        dtypes = _csv_dtypes(path, categories or {})
+        return _csv_chunk(pd.read_csv(path, dtype=dtypes), dtypes)
+    raise ValueError(f"Unsupported results format: {path}")
+
+
+def iter_results(path, chunksize=100_000, categories=None):
+    """
+    Stream a results file in chunks for result sets that don't fit in memory.
+
+    Every chunk uses the same categories, so codes can be compared across chunks and
+    chunks can be concatenated without falling back to object columns.
+
+    Parameters:
+    - path (str): '.csv' or '.npz' results file.
+    - chunksize (int): Maximum number of rows per chunk.
+    - categories (dict, optional): Maps a label column to its full list of categories.
+      For CSV files missing categories are collected with one pass over the label columns.
+
+    Yields:
+    - pd.DataFrame: Consecutive chunks of the results.
+    """
+    if path.endswith(".npz"):
+        arrays = _open_npz(path)
+        n_rows = len(
+            next(v for k, v in arrays.items() if not k.endswith(CATEGORIES_SUFFIX))
+        )
+        for start in range(0, n_rows, chunksize):
+            chunk = _npz_frame(arrays, start, start + chunksize)
+            yield optimize_results_frame(chunk, categories) if categories else chunk
+        return
+    if path.endswith(".csv"):
+        dtypes = _csv_dtypes(path, categories or {})
+        for chunk in pd.read_csv(path, dtype=dtypes, chunksize=chunksize):
+            yield _csv_chunk(chunk, dtypes)
+        return
+    raise ValueError(f"Unsupported results format: {path}")
+
+
+def select_rows(df, column, values, exclude=False):
+    """
+    Boolean mask of the rows whose label is (or, with exclude=True, is not) in values.
+
+    For categorical columns the labels are translated to codes once and the rows are
+    compared as integers, avoiding a string compare per row.
+
+    Parameters:
+    - df (pd.DataFrame): Results DataFrame.
+    - column (str): Label column to filter on (e.g., 'Stock').
+    - values (list or str): Label(s) to match.
+    - exclude (bool): Invert the mask.
+
+    Returns:
+    - np.ndarray: Boolean mask aligned with df.
+    """
+    if isinstance(values, str):
+        values = [values]
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        wanted = series.cat.categories.get_indexer(list(values))
+        mask = np.isin(series.cat.codes.to_numpy(), wanted[wanted >= 0])
+    else:
+        mask = series.isin(values).to_numpy()
+    return ~mask if exclude else mask
+
+
+# Example usage: round-trip the sample results through both formats
+if __name__ == "__main__":
+    import tempfile
+
+    from sample_results import sample_results_frame
+
+    df = sample_results_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ["csv", "npz"]:
+            path = os.path.join(tmp, f"results.{ext}")
+            save_results(df, path)
+            loaded = load_results(path)
+            chunks = list(iter_results(path, chunksize=7))
+            print(f"{ext}: {len(loaded)} rows in {len(chunks)} chunks")
+            print(loaded.dtypes.to_string())
+            market = select_rows(loaded, "Model", "Actual Market")
+            print(f"Actual Market rows: {market.sum()}\n")
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from results_io import (
+    CATEGORIES_SUFFIX,
+    CODES_SUFFIX,
+    CATEGORY_COLUMNS,
+    METRIC_DTYPE,
+    _as_category,
+    _is_metric,
+)
+
+_MANIFEST_FILE = "manifest.jsonl"
+_RUNS_DIR = "runs"
+
+# Columns larger than this are memory-mapped by queries instead of read whole
+_MMAP_BYTES = 1 << 20
+
+
+class ResultsWarehouse:
+    """
+    Local store of many results DataFrames, one directory per run.
+
+    Every run directory holds one .npy file per column, laid out like the NPZ results
+    files of results_io: label and other text columns as int32 codes
+    ('<column>__codes.npy') plus their labels ('<column>__categories.npy'), metrics as
+    float32. An append-only manifest (one JSON line per run) records when each run was
+    written, its tags, columns and labels, so queries skip runs that cannot match
+    without touching their files and read only the columns they need from the rest.
+    """
+
+    def __init__(self, directory):
+        """
+        Parameters:
+        - directory (str): Warehouse directory (created if needed).
+        """
+        self.directory = directory
+        os.makedirs(os.path.join(directory, _RUNS_DIR), exist_ok=True)
+        self._manifest = []
+        self._manifest_size = 0
+
+    def _run_path(self, run_id, name=None):
+        path = os.path.join(self.directory, _RUNS_DIR, run_id)
+        return path if name is None else os.path.join(path, f"{name}.npy")
+
+    def write_run(self, df, timestamp=None, tags=None, run_id=None):
+        """
+        Store a results DataFrame as a new run.
+
+        Parameters:
+        - df (pd.DataFrame): Results with columns 'Model', 'Stock' and the metrics.
+        - timestamp (str or np.datetime64, optional): Time of the run (default: now).
+        - tags (dict, optional): JSON-serializable run metadata (e.g., {'cost': 0.003}).
+        - run_id (str, optional): Name of the run (default: derived from the timestamp).
+
+        Returns:
+        - str: The run id.
+        """
+        timestamp = np.datetime64(
+            "now" if timestamp is None else timestamp, "s"
+        ).astype(str)
+        if run_id is None:
+            run_id = (
+                f"{timestamp.replace(':', '').replace('-', '')}-{uuid.uuid4().hex[:8]}"
+            )
+        labels = {}
+        layout = hashlib.sha256()
+        # Write into a temporary directory first so readers never see a partial run
+        staging = tempfile.mkdtemp(dir=os.path.join(self.directory, _RUNS_DIR))
+        try:
+            for column in df.columns:
+                if column in CATEGORY_COLUMNS or not _is_metric(df[column]):
+                    values = _as_category(df[column])
+                    labels[column] = [str(label) for label in values.cat.categories]
+                    codes = values.cat.codes.to_numpy(np.int32)
+                    if column in CATEGORY_COLUMNS:
+                        layout.update(json.dumps(labels[column]).encode())
+                        layout.update(codes.tobytes())
+                    np.save(os.path.join(staging, f"{column}{CODES_SUFFIX}.npy"), codes)
+                    np.save(
+                        os.path.join(staging, f"{column}{CATEGORIES_SUFFIX}.npy"),
+                        np.array(labels[column], dtype=str),
+                    )
+                else:
+                    np.save(
+                        os.path.join(staging, f"{column}.npy"),
+                        df[column].to_numpy(METRIC_DTYPE),
+                    )
+            os.replace(staging, self._run_path(run_id))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        entry = {
+            "run_id": run_id,
+            "timestamp": timestamp,
+            "rows": len(df),
+            "columns": [str(column) for column in df.columns],
+            "labels": labels,
+            "tags": tags or {},
+            # Runs with identical label columns share their row selections in queries
+            "layout": layout.hexdigest()[:16],
+        }
+        _append_line(os.path.join(self.directory, _MANIFEST_FILE), json.dumps(entry))
+        return run_id
+
+    def manifest(self):
+        """
+        Entries of every stored run, oldest first.
+
+        The manifest is append-only, so only the lines added since the last call are
+        parsed. A trailing line without its newline (a write still in progress, or cut
+        short by a crash) is left for a later call.
+
+        Returns:
+        - list: One dict per run ('run_id', 'timestamp', 'rows', 'columns', 'labels', 'tags').
+        """
+        path = os.path.join(self.directory, _MANIFEST_FILE)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return []
+        if size != self._manifest_size:
+            with open(path, "rb") as fh:
+                fh.seek(self._manifest_size)
+                data = fh.read()
+            complete = data.rfind(b"\n") + 1
+            self._manifest += [
+                json.loads(line)
+                for line in data[:complete].splitlines()
+                if line.strip()
+            ]
+            self._manifest_size += complete
+        return self._manifest
+
+    def runs(
+        self, start=None, end=None, model=None, stock=None, metric=None, tags=None
+    ):
+        """
+        Manifest entries matching a filter, using only the manifest.
+
+        Parameters:
+        - start (str or np.datetime64, optional): Earliest run time to include.
+        - end (str or np.datetime64, optional): Latest run time to include.
+        - model (str, optional): Only runs containing this model.
+        - stock (str, optional): Only runs containing this stock.
+        - metric (str, optional): Only runs with this metric column.
+        - tags (dict, optional): Only runs whose tags include these items.
+
+        Returns:
+        - list: Matching manifest entries, oldest first.
+        """
+        start = None if start is None else np.datetime64(start, "s")
+        end = None if end is None else np.datetime64(end, "s")
+        matches = []
+        for entry in self.manifest():
+            when = np.datetime64(entry["timestamp"], "s")
+            if (start is not None and when < start) or (end is not None and when > end):
+                continue
+            if model is not None and model not in entry["labels"].get("Model", ()):
+                continue
+            if stock is not None and stock not in entry["labels"].get("Stock", ()):
+                continue
+            if metric is not None and metric not in entry["columns"]:
+                continue
+            if tags and any(entry["tags"].get(k) != v for k, v in tags.items()):
+                continue
+            matches.append(entry)
+        return matches
+
+    def load_run(self, run_id, columns=None):
+        """
+        Load one run as a DataFrame with categorical labels/text and float32 metrics.
+
+        Parameters:
+        - run_id (str): Run id from write_run or the manifest.
+        - columns (list, optional): Columns to load (default: all).
+
+        Returns:
+        - pd.DataFrame: The stored results.
+        """
+        entry = next(e for e in self.manifest() if e["run_id"] == run_id)
+        frame = {}
+        for column in columns or entry["columns"]:
+            if column in entry["labels"]:
+                codes = np.load(self._run_path(run_id, column + CODES_SUFFIX))
+                frame[column] = pd.Categorical.from_codes(
+                    codes, categories=entry["labels"][column]
+                )
+            else:
+                frame[column] = np.load(self._run_path(run_id, column))
+        return pd.DataFrame(frame)
+
+    def query(self, metric, model=None, stock=None, start=None, end=None, tags=None):
+        """
+        One metric across runs, reading only the columns the filter needs.
+
+        Runs are first narrowed with the manifest; for each remaining run only the label
+        code columns and the metric column are read (large ones memory-mapped).
+
+        Parameters:
+        - metric (str): Metric column (e.g., 'ROI'); text columns come back as labels.
+        - model (str, optional): Restrict to one model.
+        - stock (str, optional): Restrict to one stock.
+        - start (str or np.datetime64, optional): Earliest run time to include.
+        - end (str or np.datetime64, optional): Latest run time to include.
+        - tags (dict, optional): Only runs whose tags include these items.
+
+        Returns:
+        - pd.DataFrame: Columns 'Run', 'Timestamp', 'Model', 'Stock' and the metric, one
+          row per matching result.
+        """
+        columns = {"Run": [], "Timestamp": [], "Model": [], "Stock": [], metric: []}
+        selections = {}
+        for entry in self.runs(start, end, model, stock, metric, tags):
+            run_id = entry["run_id"]
+            selection = selections.get(entry["layout"])
+            if selection is None:
+                selection = self._select(entry, model, stock)
+                selections[entry["layout"]] = selection
+            rows, row_labels = selection
+            if metric in entry["labels"]:
+                codes = _read_column(
+                    self._run_path(run_id, metric + CODES_SUFFIX), np.int32
+                )
+                values = np.asarray(entry["labels"][metric], dtype=object)[codes[rows]]
+            else:
+                values = _read_column(self._run_path(run_id, metric), METRIC_DTYPE)
+                values = values[rows]
+            columns["Run"].append(np.repeat(run_id, len(values)))
+            columns["Timestamp"].append(
+                np.repeat(np.datetime64(entry["timestamp"], "s"), len(values))
+            )
+            for column in ("Model", "Stock"):
+                columns[column].append(row_labels[column])
+            columns[metric].append(np.asarray(values))
+        if not columns[metric]:
+            return pd.DataFrame(columns=list(columns))
+        return pd.DataFrame({k: np.concatenate(v) for k, v in columns.items()})
+
+    def _select(self, entry, model, stock):
+        """Rows of a run matching the model/stock filter, and their labels."""
+        codes = {}
+        mask = None
+        for column, label in (("Model", model), ("Stock", stock)):
+            codes[column] = _read_column(
+                self._run_path(entry["run_id"], column + CODES_SUFFIX), np.int32
+            )
+            if label is not None:
+                wanted = codes[column] == entry["labels"][column].index(label)
+                mask = wanted if mask is None else mask & wanted
+        rows = slice(None) if mask is None else np.flatnonzero(mask)
+        row_labels = {
+            column: np.asarray(entry["labels"][column], dtype=object)[
+                codes[column][rows]
+            ]
+            for column in codes
+        }
+        return rows, row_labels
+
+
+def _append_line(path, line):
+    """
+    Append one line to a file with a single write, flushed to disk.
+
+    A partial last line left by a crash is cut off first, so the new line starts on a
+    line of its own.
+    """
+    with open(path, "ab+") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        if end:
+            fh.seek(end - 1)
+            if fh.read(1) != b"\n":
+                # Walk back to the end of the last complete line
+                while end > 0:
+                    step = min(end, 4096)
+                    fh.seek(end - step)
+                    newline = fh.read(step).rfind(b"\n")
+                    if newline >= 0:
+                        end = end - step + newline + 1
+                        break
+                    end -= step
+                fh.truncate(end)
+        fh.write((line + "\n").encode())
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _read_column(path, dtype):
+    """
+    Read a 1-D column written by np.save, skipping the header instead of parsing it.
+
+    Columns above _MMAP_BYTES are memory-mapped so a row selection only touches its pages.
+    """
+    with open(path, "rb") as fh:
+        major = fh.read(8)[6]
+        header_len = int.from_bytes(fh.read(2 if major == 1 else 4), "little")
+        offset = fh.tell() + header_len
+        if os.fstat(fh.fileno()).st_size - offset > _MMAP_BYTES:
+            return np.memmap(path, dtype=dtype, mode="r", offset=offset)
+        fh.seek(offset)
+        return np.fromfile(fh, dtype=dtype)
+
+
+# Example usage: store 2,000 runs of the sample results, then query one model's ROI
+if __name__ == "__main__":
+    from sample_results import sample_results_frame
+
+    rng = np.random.default_rng(23)
+    base = sample_results_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = ResultsWarehouse(tmp)
+        start = time.perf_counter()
+        for day in range(2_000):
+            df = base.assign(ROI=base["ROI"] * rng.uniform(0.8, 1.2, len(base)))
+            warehouse.write_run(
+                df,
+                timestamp=np.datetime64("2020-01-01T18:00") + np.timedelta64(day, "D"),
+                tags={"cost": 0.003 if day % 2 else 0.0},
+            )
+        print(f"Wrote 2,000 runs in {time.perf_counter() - start:.2f}s")
+
+        fresh = ResultsWarehouse(tmp)
+        start = time.perf_counter()
+        fresh.manifest()
+        print(f"Read the manifest in {(time.perf_counter() - start) * 1000:.0f}ms")
+        start = time.perf_counter()
+        history = fresh.query("ROI", model="MFA_Multi_indicator", stock="AAPL")
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{len(history)} historical ROI values in {elapsed:.0f}ms")
+        print(history.tail())
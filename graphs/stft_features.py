@@ -0,0 +1,139 @@
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FEATURE_DTYPE = np.float32
+
+
+def frame_series(x, frame_length, hop_length):
+    """
+    Split series into overlapping frames without copying.
+
+    Parameters:
+    - x (np.ndarray): Series shaped (..., n_samples).
+    - frame_length (int): Samples per frame.
+    - hop_length (int): Samples between the starts of consecutive frames.
+
+    Returns:
+    - np.ndarray: Read-only strided view shaped (..., n_frames, frame_length).
+    """
+    if x.shape[-1] < frame_length:
+        raise ValueError(
+            f"Series of length {x.shape[-1]} is shorter than one frame ({frame_length})"
+        )
+    return sliding_window_view(x, frame_length, axis=-1)[..., ::hop_length, :]
+
+
+def n_frames(n_samples, frame_length, hop_length):
+    """Number of frames frame_series produces for a series of n_samples."""
+    return (n_samples - frame_length) // hop_length + 1
+
+
+def stft_spectrogram(
+    prices, frame_length=32, hop_length=8, use_log_returns=True, log_power=True
+):
+    """
+    Short-time Fourier transform spectrograms for many price series at once.
+
+    Every series is framed with a strided view, windowed with a Hann window and transformed
+    with a single batched np.fft.rfft call over the last axis.
+
+    Parameters:
+    - prices (array-like): Prices shaped (n_series, n_bars) (or (n_bars,) for one series).
+    - frame_length (int): Bars per STFT frame.
+    - hop_length (int): Bars between consecutive frames.
+    - use_log_returns (bool): Transform log returns instead of raw prices, which removes
+      the price level and trend that would otherwise dominate the low frequencies.
+    - log_power (bool): Return log1p of the power spectrum instead of the magnitude.
+
+    Returns:
+    - np.ndarray: float32 spectrograms shaped (n_series, n_frames, frame_length // 2 + 1).
+    """
+    x = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    if use_log_returns:
+        x = np.diff(np.log(x), axis=-1)
+
+    frames = frame_series(x, frame_length, hop_length)
+    # Remove each frame's mean so the DC bin doesn't swamp the spectrum
+    frames = frames - frames.mean(axis=-1, keepdims=True)
+    spectrum = np.fft.rfft(frames * np.hanning(frame_length), axis=-1)
+
+    if log_power:
+        return np.log1p(np.abs(spectrum) ** 2).astype(FEATURE_DTYPE)
+    return np.abs(spectrum).astype(FEATURE_DTYPE)
+
+
+def stft_to_memmap(
+    prices,
+    path,
+    frame_length=32,
+    hop_length=8,
+    batch_size=256,
+    use_log_returns=True,
+    log_power=True,
+):
+    """
+    Compute spectrograms batch by batch into a memory-mapped '.npy' file.
+
+    Only one batch of series is transformed at a time, so the feature set can be larger
+    than memory; the result can later be opened with np.load(path, mmap_mode='r').
+
+    Parameters:
+    - prices (array-like): Prices shaped (n_series, n_bars); may itself be a memmap.
+    - path (str): Destination '.npy' file.
+    - frame_length (int): Bars per STFT frame.
+    - hop_length (int): Bars between consecutive frames.
+    - batch_size (int): Series transformed per batch.
+    - use_log_returns (bool): Transform log returns instead of raw prices.
+    - log_power (bool): Store log1p of the power spectrum instead of the magnitude.
+
+    Returns:
+    - np.memmap: The written features, shaped (n_series, n_frames, frame_length // 2 + 1).
+    """
+    n_series, n_bars = prices.shape
+    n_samples = n_bars - 1 if use_log_returns else n_bars
+    shape = (
+        n_series,
+        n_frames(n_samples, frame_length, hop_length),
+        frame_length // 2 + 1,
+    )
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=FEATURE_DTYPE, shape=shape)
+    for start in range(0, n_series, batch_size):
+        out[start : start + batch_size] = stft_spectrogram(
+            prices[start : start + batch_size],
+            frame_length,
+            hop_length,
+            use_log_returns,
+            log_power,
+        )
+    out.flush()
+    return out
+
+
+# Example usage: spectrogram features for a synthetic stock universe
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    rng = np.random.default_rng(11)
+    n_series, n_bars = 2000, 1500
+    prices = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0003, 0.02, (n_series, n_bars)), axis=1)
+    )
+
+    start = time.perf_counter()
+    features = stft_spectrogram(prices)
+    elapsed = time.perf_counter() - start
+    print(f"In-memory STFT {features.shape} {features.dtype} in {elapsed:.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stft_features.npy")
+        start = time.perf_counter()
+        stft_to_memmap(prices, path)
+        elapsed = time.perf_counter() - start
+        mapped = np.load(path, mmap_mode="r")
+        print(
+            f"Memory-mapped STFT {mapped.shape} in {elapsed:.2f}s, matches: {np.allclose(mapped, features)}"
+        )
+        del mapped
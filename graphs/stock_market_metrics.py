@@ -1,10 +1,414 @@
+import functools
+import os
+import shutil
+import sys
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.ticker import FuncFormatter
 
+from bootstrap import ci_columns
+from plot_cache import source_digest
+from results_io import select_rows
+
+
+def metric_slice(df, metric, stocks):
+    """
+    Select the rows of df that are plotted for a metric.
+
+    Filters run on category codes when 'Model'/'Stock' are categorical (see results_io), and
+    categories left without rows are dropped so they don't show up as empty bars.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics.
+    - metric (str): Metric column name being plotted.
+    - stocks (list): List of stock names to include.
+
+    Returns:
+    - pd.DataFrame: The filtered rows.
+    """
+    mask = select_rows(df, "Stock", stocks)
+    # Exclude 'Actual Market' model for direction metrics since they don't apply
+    if metric in ["Accuracy", "Precision", "Recall", "Number_of_Trades"]:
+        mask = mask & select_rows(df, "Model", "Actual Market", exclude=True)
+    plot_df = df[mask]
+    for column in ["Model", "Stock"]:
+        if isinstance(plot_df[column].dtype, pd.CategoricalDtype):
+            plot_df = plot_df.assign(
+                **{column: plot_df[column].cat.remove_unused_categories()}
+            )
+    return plot_df
+
+
+def metric_formatter(metric):
+    """
+    Return the function that formats a single value of a metric for axes and labels.
+
+    Parameters:
+    - metric (str): Metric column name (e.g., 'ROI').
+
+    Returns:
+    - callable: Maps a number to its display string.
+    """
+    if metric in [
+        "ROI",
+        "CAGR",
+        "Accuracy",
+        "Precision",
+        "Recall",
+        "Volatility",
+        "Max_Drawdown",
+        "VaR",
+        "CVaR",
+        "Probability_of_Ruin",
+    ]:
+        return lambda value: f"{value * 100:.2f}%"
+    if metric == "Number_of_Trades":
+        return lambda value: f"{value:.0f}"
+    return lambda value: f"{value:,.2f}"
+
+
+def format_labels(values, metric):
+    """
+    Format an array of metric values as value labels, leaving NaN and zero values blank.
+
+    Parameters:
+    - values (array-like): Values to label.
+    - metric (str): Metric column name, selects the number format.
+
+    Returns:
+    - np.ndarray: Object array of label strings shaped like values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keep = ~np.isnan(values) & (values != 0)
+    labels = np.full(values.shape, "", dtype=object)
+    formatter = metric_formatter(metric)
+    labels[keep] = [formatter(value) for value in values[keep]]
+    return labels
+
+
+def _label_codes(series, order=None):
+    """Integer codes of a label column and the labels they index, in display order."""
+    if order is not None:
+        present = set(series.unique())
+        categories = [label for label in order if label in present]
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+    else:
+        categories = pd.unique(series)
+    labels = pd.Categorical(series, categories=categories)
+    return labels.codes.astype(np.int64), list(labels.categories)
+
+
+def metric_matrix(plot_df, metric, stocks=None):
+    """
+    Pivot the rows of a metric into a dense models x stocks matrix without a Python loop.
+
+    Repeated (model, stock) rows are averaged, matching what the bar chart shows.
+
+    Parameters:
+    - plot_df (pd.DataFrame): Rows to pivot, with columns 'Model', 'Stock' and the metric.
+    - metric (str): Metric column name to pivot.
+    - stocks (list, optional): Column order of the matrix; defaults to order of appearance.
+
+    Returns:
+    - tuple: (matrix, models, stocks) where matrix has shape (len(models), len(stocks)).
+    """
+    model_codes, models = _label_codes(plot_df["Model"])
+    stock_codes, stock_names = _label_codes(plot_df["Stock"], stocks)
+
+    n_models, n_stocks = len(models), len(stock_names)
+    values = plot_df[metric].to_numpy(dtype=np.float64)
+    cells = model_codes * n_stocks + stock_codes
+    valid = ~np.isnan(values) & (model_codes >= 0) & (stock_codes >= 0)
 
-def plot_model_performance(df, metrics, stocks):
+    # Scatter the values into cells with bincount and average repeated rows
+    size = n_models * n_stocks
+    sums = np.bincount(cells[valid], weights=values[valid], minlength=size)
+    counts = np.bincount(cells[valid], minlength=size)
+    with np.errstate(invalid="ignore"):
+        matrix = (sums / counts).reshape(n_models, n_stocks)
+    return matrix, models, stock_names
+
+
+def draw_error_bars(ax, plot_df, metric):
+    """
+    Add confidence-interval error bars to a grouped bar chart drawn by plot_metric.
+
+    Does nothing unless plot_df has the '<metric>_CI_Low' and '<metric>_CI_High' columns
+    (see bootstrap.add_confidence_intervals).
+
+    Parameters:
+    - ax (matplotlib.axes.Axes): Axes holding the seaborn bar chart.
+    - plot_df (pd.DataFrame): The rows the chart was drawn from.
+    - metric (str): Metric column plotted on the chart.
+    """
+    low_column, high_column = ci_columns(metric)
+    if low_column not in plot_df or high_column not in plot_df:
+        return
+
+    # Seaborn draws one container per hue level (stock) with one bar per x tick (model)
+    _, stocks = _label_codes(plot_df["Stock"])
+    low, models, _ = metric_matrix(plot_df, low_column, stocks)
+    high, _, _ = metric_matrix(plot_df, high_column, stocks)
+    model_rows = {model: row for row, model in enumerate(models)}
+    tick_models = [tick.get_text() for tick in ax.get_xticklabels()]
+
+    xs, heights, rows, columns = [], [], [], []
+    for column, container in enumerate(ax.containers[: len(stocks)]):
+        for patch in container:
+            x = patch.get_x() + patch.get_width() / 2.0
+            row = model_rows.get(tick_models[int(round(x))])
+            if row is not None:
+                xs.append(x)
+                heights.append(patch.get_height())
+                rows.append(row)
+                columns.append(column)
+
+    heights = np.asarray(heights)
+    lower = heights - low[rows, columns]
+    upper = high[rows, columns] - heights
+    keep = ~(np.isnan(lower) | np.isnan(upper))
+    if keep.any():
+        ax.errorbar(
+            np.asarray(xs)[keep],
+            heights[keep],
+            yerr=np.clip([lower[keep], upper[keep]], 0.0, None),
+            fmt="none",
+            ecolor="black",
+            elinewidth=1,
+            capsize=3,
+        )
+
+
+def plot_metric_heatmap(df, metric, stocks, cost=None, annotate=None, max_labels=500):
+    """
+    Draw one metric as a models x stocks heatmap, suited to large stock universes.
+
+    The whole matrix is a single image, so render time stays flat as stocks are added,
+    unlike the bar chart which draws (and labels) one patch per bar.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics.
+    - metric (str): Metric column name to plot (e.g., 'ROI').
+    - stocks (list): List of stock names to include in the plot.
+    - cost (float, optional): Per-trade transaction cost already applied to df, shown in the title.
+    - annotate (bool, optional): Write the value in each cell. Defaults to True only when the
+      matrix has at most max_labels cells.
+    - max_labels (int): Cell count up to which values are annotated by default.
+
+    Returns:
+    - matplotlib.figure.Figure: The figure holding the chart.
+    """
+    plot_df = metric_slice(df, metric, stocks)
+    matrix, models, stock_names = metric_matrix(plot_df, metric, stocks)
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    image = ax.imshow(
+        np.ma.masked_invalid(matrix),
+        aspect="auto",
+        interpolation="nearest",
+        cmap="viridis",
+    )
+    colorbar = fig.colorbar(image, ax=ax)
+    colorbar.set_label(metric, fontsize=12)
+    colorbar.formatter = FuncFormatter(lambda y, _: metric_formatter(metric)(y))
+    colorbar.update_ticks()
+
+    title = f"Comparison of {metric} Across Models and Stocks"
+    if cost is not None:
+        title += f" With Transactional Cost Of {cost * 100:g}% Per Trade"
+    ax.set_title(title, fontsize=14, pad=10)
+    ax.set_xlabel("Stocks", fontsize=12)
+    ax.set_ylabel("Models", fontsize=12)
+    ax.set_yticks(range(len(models)), labels=models)
+    # Individual stock names only stay readable for small universes
+    if len(stock_names) <= 60:
+        ax.set_xticks(range(len(stock_names)), labels=stock_names, rotation=90)
+    ax.grid(False)
+
+    if annotate is None:
+        annotate = matrix.size <= max_labels
+    if annotate:
+        labels = format_labels(matrix, metric)
+        rows, columns = np.nonzero(labels != "")
+        for row, column in zip(rows, columns):
+            ax.text(
+                column,
+                row,
+                labels[row, column],
+                ha="center",
+                va="center",
+                fontsize=8,
+                color="white",
+            )
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_metric(df, metric, stocks, cost=None):
+    """
+    Draw a single grouped bar chart comparing the models across stocks for one metric.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics (e.g., 'ROI', 'CAGR').
+    - metric (str): Metric column name to plot (e.g., 'ROI').
+    - stocks (list): List of stock names to include in the plot (e.g., ['AAPL', 'NVDA', 'TSLA']).
+    - cost (float, optional): Per-trade transaction cost already applied to df, shown in the title.
+
+    Returns:
+    - matplotlib.figure.Figure: The figure holding the chart.
+    """
+    plot_df = metric_slice(df, metric, stocks)
+
+    # Create a new figure for the metric
+    fig = plt.figure(figsize=(12, 6))
+    ax = sns.barplot(
+        x="Model",
+        y=metric,
+        hue="Stock",
+        data=plot_df,
+        palette="muted",
+    )
+
+    # Set a clear title and labels
+    title = f"Comparison of {metric} Across Models and Stocks"
+    if cost is not None:
+        title += f" With Transactional Cost Of {cost * 100:g}% Per Trade"
+    plt.title(title, fontsize=14, pad=10)
+    plt.xlabel("Models", fontsize=12)
+    plt.ylabel(metric, fontsize=12)
+    plt.legend(title="Stock", bbox_to_anchor=(1.05, 1), loc="upper left")
+
+    # Format the y-axis based on the metric
+    ax.yaxis.set_major_formatter(
+        FuncFormatter(lambda y, _: metric_formatter(metric)(y))
+    )
+
+    # Add value labels on top of each bar, skipping NaN or zero values
+    for container in ax.containers:
+        ax.bar_label(
+            container,
+            labels=format_labels(container.datavalues, metric),
+            padding=5,
+            fontsize=8,
+        )
+
+    # Draw bootstrap confidence intervals when the frame carries them
+    draw_error_bars(ax, plot_df, metric)
+
+    # Adjust layout to prevent overlap
+    plt.tight_layout()
+    return fig
+
+
+# Chart renderers selectable through the `mode` argument
+PLOT_MODES = {"bar": plot_metric, "heatmap": plot_metric_heatmap}
+
+
+@functools.lru_cache(maxsize=None)
+def _drawing_digest():
+    """Hash of this module's drawing code, part of every cached chart's key."""
+    return source_digest(sys.modules[__name__])
+
+
+def save_figure(fig, output_dir, name, formats=("png",)):
+    """
+    Write a figure to disk once per requested file format.
+
+    Parameters:
+    - fig (matplotlib.figure.Figure): Figure to save.
+    - output_dir (str): Directory the files are written to (created if missing).
+    - name (str): File name without extension (e.g., 'ROI').
+    - formats (tuple): File extensions to write (e.g., ('png', 'svg')).
+
+    Returns:
+    - list: Paths of the written files.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        fig.savefig(path, format=fmt, bbox_inches="tight")
+        paths.append(path)
+    return paths
+
+
+def render_metric_files(
+    df, metric, stocks, output_dir, formats=("png",), cost=None, cache=None, mode="bar"
+):
+    """
+    Render one metric chart to files, reusing cached images when the plotted rows are unchanged.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics.
+    - metric (str): Metric column name to plot (e.g., 'ROI').
+    - stocks (list): List of stock names to include in the plot.
+    - output_dir (str): Directory the chart files are written to.
+    - formats (tuple): File formats to write (e.g., ('png', 'svg')).
+    - cost (float, optional): Per-trade transaction cost already applied to df.
+    - cache (PlotCache, optional): Cache of previously rendered images (see plot_cache).
+    - mode (str): Chart type, 'bar' or 'heatmap' (see PLOT_MODES).
+
+    Returns:
+    - list: Paths of the written files.
+    """
+    draw = PLOT_MODES[mode]
+    name = metric if cost is None else f"{metric}_with_cost"
+    if cache is None:
+        fig = draw(df, metric, stocks, cost=cost)
+        try:
+            return save_figure(fig, output_dir, name, formats)
+        finally:
+            plt.close(fig)
+
+    plot_df = metric_slice(df, metric, stocks)
+    key = cache.key(
+        plot_df,
+        metric=metric,
+        stocks=list(stocks),
+        cost=cost,
+        mode=mode,
+        style=dict(sns.axes_style()),
+        dpi=plt.rcParams["savefig.dpi"],
+        code=_drawing_digest(),
+    )
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    missing = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        cached = cache.get(key, fmt)
+        if cached is None:
+            missing.append(fmt)
+        else:
+            shutil.copyfile(cached, path)
+        paths.append(path)
+
+    # Only render when at least one format isn't cached yet
+    if missing:
+        fig = draw(plot_df, metric, stocks, cost=cost)
+        try:
+            for path in save_figure(fig, output_dir, name, missing):
+                cache.put(key, os.path.splitext(path)[1][1:], path)
+        finally:
+            plt.close(fig)
+    return paths
+
+
+def plot_model_performance(
+    df,
+    metrics,
+    stocks,
+    output_dir=None,
+    formats=("png",),
+    cost=None,
+    cache=None,
+    mode="bar",
+):
     """
     Generate grouped bar charts to compare the performance of different models across stocks for specified metrics.
 
@@ -12,320 +416,50 @@ def plot_model_performance(df, metrics, stocks):
     - df (pd.DataFrame): DataFrame with columns 'Model', 'Stock', and the metrics (e.g., 'ROI', 'CAGR').
     - metrics (list): List of metric column names to plot (e.g., ['ROI', 'CAGR']).
     - stocks (list): List of stock names to include in the plots (e.g., ['AAPL', 'NVDA', 'TSLA']).
+    - output_dir (str, optional): When given, each chart is saved as '<metric>.<format>' in this
+      directory and closed instead of being shown interactively.
+    - formats (tuple): File formats written when output_dir is set (e.g., ('png', 'svg')).
+    - cost (float, optional): Per-trade transaction cost already applied to df. It is shown
+      in the titles and saved charts get a '_with_cost' suffix.
+    - cache (PlotCache, optional): Reuse previously rendered images for unchanged charts.
+      Only used together with output_dir.
+    - mode (str): 'bar' for grouped bar charts, or 'heatmap' for a models x stocks heatmap
+      that stays fast for thousands of stocks.
+
+    Returns:
+    - list: Paths of the written files (empty when the charts are shown interactively).
     """
     # Set Seaborn style for better visuals
     sns.set_style("whitegrid")
 
+    paths = []
     for metric in metrics:
-        # Filter data: exclude 'Actual Market' model for 'Accuracy' since it doesn't apply
-        if metric == "Accuracy" or metric == "Number_of_Trades":
-            plot_df = df[df["Model"] != "Actual Market"]
+        if output_dir is None:
+            PLOT_MODES[mode](df, metric, stocks, cost=cost)
+            plt.show()
         else:
-            plot_df = df.copy()
-
-        # Create a new figure for each metric
-        plt.figure(figsize=(12, 6))
-        ax = sns.barplot(
-            x="Model",
-            y=metric,
-            hue="Stock",
-            data=plot_df[plot_df["Stock"].isin(stocks)],
-            palette="muted",
-        )
-
-        # Set a clear title and labels
-        plt.title(
-            f"Comparison of {metric} Across Models and Stocks", fontsize=14, pad=10
-        )
-        plt.xlabel("Models", fontsize=12)
-        plt.ylabel(metric, fontsize=12)
-        plt.legend(title="Stock", bbox_to_anchor=(1.05, 1), loc="upper left")
-
-        # Format the y-axis based on the metric
-        if metric in ["ROI", "CAGR", "Accuracy"]:
-            ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{y * 100:.2f}%"))
-        elif metric == "Number_of_Trades":
-            ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{y:.0f}"))
-        elif metric == "Final_Capital":
-            ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{y:,.2f}"))
-
-        # Add value labels on top of each bar, skipping NaN or zero values
-        for p in ax.patches:
-            height = p.get_height()
-            if pd.notna(height) and height != 0:  # Skip NaN and zero values
-                if metric in ["ROI", "CAGR", "Accuracy"]:
-                    label = f"{height * 100:.2f}%"
-                elif metric == "Number_of_Trades":
-                    label = f"{height:.0f}"
-                elif metric == "Final_Capital":
-                    label = f"{height:,.2f}"
-                ax.annotate(
-                    label,
-                    (p.get_x() + p.get_width() / 2.0, height),
-                    ha="center",
-                    va="center",
-                    xytext=(0, 5),
-                    textcoords="offset points",
-                    fontsize=8,
-                )
-
-        # Adjust layout to prevent overlap
-        plt.tight_layout()
-        plt.show()
+            paths += render_metric_files(
+                df, metric, stocks, output_dir, formats, cost, cache, mode
+            )
+    return paths
 
 
 # Example usage with real data from the CSV
 if __name__ == "__main__":
-    # Define the stocks from the CSV
-    stocks = ["Yuanta", "TATAMOTORS", "SHREECEMENT", "RIL", "HDFCBANK", "AAPL"]
-
-    # Define the models based on the CSV columns
-    models = [
-        "Actual Market",
-        "Attention_CNN_BiLSTM_STFT",
-        "MFA_STFT",
-        "Attention_CNN_BiLSTM_Multi_Indicator",
-        "MFA_Multi_indicator",
-    ]
-
-    # Sample data: nested dictionary for easier manual input
-    # - Outer key: Model name
-    # - Inner key: Stock ticker
-    # - Values: Dictionary of metrics (ROI, CAGR, Number_of_Trades, Final_Capital, Accuracy)
-    data = {
-        "Actual Market": {
-            "Yuanta": {
-                "ROI": 0.6383,
-                "CAGR": 0.2799,
-                "Number_of_Trades": 0,
-                "Final_Capital": 163830,
-                "Accuracy": None,
-            },
-            "TATAMOTORS": {
-                "ROI": 1.0854,
-                "CAGR": 0.4441,
-                "Number_of_Trades": 0,
-                "Final_Capital": 208540,
-                "Accuracy": None,
-            },
-            "SHREECEMENT": {
-                "ROI": 0.2374,
-                "CAGR": 0.1124,
-                "Number_of_Trades": 0,
-                "Final_Capital": 123740,
-                "Accuracy": None,
-            },
-            "RIL": {
-                "ROI": 0.2558,
-                "CAGR": 0.1206,
-                "Number_of_Trades": 0,
-                "Final_Capital": 125580,
-                "Accuracy": None,
-            },
-            "HDFCBANK": {
-                "ROI": 0.2469,
-                "CAGR": 0.1167,
-                "Number_of_Trades": 0,
-                "Final_Capital": 124690,
-                "Accuracy": None,
-            },
-            "AAPL": {
-                "ROI": 0.4219,
-                "CAGR": 0.1924,
-                "Number_of_Trades": 0,
-                "Final_Capital": 142190,
-                "Accuracy": None,
-            },
-        },
-        "Attention_CNN_BiLSTM_STFT": {
-            "Yuanta": {
-                "ROI": 0.2518,
-                "CAGR": 0.1188,
-                "Number_of_Trades": 29,
-                "Final_Capital": 125178.45,
-                "Accuracy": 0.545,
-            },
-            "TATAMOTORS": {
-                "ROI": 0.7845,
-                "CAGR": 0.3359,
-                "Number_of_Trades": 35,
-                "Final_Capital": 178452.56,
-                "Accuracy": 0.5797,
-            },
-            "SHREECEMENT": {
-                "ROI": 0.4528,
-                "CAGR": 0.2053,
-                "Number_of_Trades": 36,
-                "Final_Capital": 145275.98,
-                "Accuracy": 0.5564,
-            },
-            "RIL": {
-                "ROI": 0.5562,
-                "CAGR": 0.2475,
-                "Number_of_Trades": 19,
-                "Final_Capital": 155620.97,
-                "Accuracy": 0.5836,
-            },
-            "HDFCBANK": {
-                "ROI": 0.7196,
-                "CAGR": 0.3114,
-                "Number_of_Trades": 20,
-                "Final_Capital": 171964.72,
-                "Accuracy": 0.5077,
-            },
-            "AAPL": {
-                "ROI": 0.5879,
-                "CAGR": 0.2601,
-                "Number_of_Trades": 35,
-                "Final_Capital": 158786.36,
-                "Accuracy": 0.5931,
-            },
-        },
-        "MFA_STFT": {
-            "Yuanta": {
-                "ROI": 0.2703,
-                "CAGR": 0.1271,
-                "Number_of_Trades": 27,
-                "Final_Capital": 127026.33,
-                "Accuracy": 0.545,
-            },
-            "TATAMOTORS": {
-                "ROI": 0.8088,
-                "CAGR": 0.3449,
-                "Number_of_Trades": 31,
-                "Final_Capital": 180884.95,
-                "Accuracy": 0.5608,
-            },
-            "SHREECEMENT": {
-                "ROI": 0.1558,
-                "CAGR": 0.0751,
-                "Number_of_Trades": 32,
-                "Final_Capital": 115578.00,
-                "Accuracy": 0.5719,
-            },
-            "RIL": {
-                "ROI": 0.5366,
-                "CAGR": 0.2396,
-                "Number_of_Trades": 19,
-                "Final_Capital": 153655.15,
-                "Accuracy": 0.57,
-            },
-            "HDFCBANK": {
-                "ROI": 0.7114,
-                "CAGR": 0.3082,
-                "Number_of_Trades": 23,
-                "Final_Capital": 171139.66,
-                "Accuracy": 0.5116,
-            },
-            "AAPL": {
-                "ROI": 0.5920,
-                "CAGR": 0.2618,
-                "Number_of_Trades": 28,
-                "Final_Capital": 159203.51,
-                "Accuracy": 0.6387,
-            },
-        },
-        "Attention_CNN_BiLSTM_Multi_Indicator": {
-            "Yuanta": {
-                "ROI": 0.5756,
-                "CAGR": 0.2552,
-                "Number_of_Trades": 5,
-                "Final_Capital": 157560.00,
-                "Accuracy": 0.86,
-            },
-            "TATAMOTORS": {
-                "ROI": 1.2669,
-                "CAGR": 0.5056,
-                "Number_of_Trades": 2,
-                "Final_Capital": 226687.01,
-                "Accuracy": 0.8307,
-            },
-            "SHREECEMENT": {
-                "ROI": 0.5555,
-                "CAGR": 0.2472,
-                "Number_of_Trades": 5,
-                "Final_Capital": 155545.00,
-                "Accuracy": 0.8657,
-            },
-            "RIL": {
-                "ROI": 0.7803,
-                "CAGR": 0.3343,
-                "Number_of_Trades": 3,
-                "Final_Capital": 178034.00,
-                "Accuracy": 0.8504,
-            },
-            "HDFCBANK": {
-                "ROI": 0.4022,
-                "CAGR": 0.1841,
-                "Number_of_Trades": 5,
-                "Final_Capital": 140218.00,
-                "Accuracy": 0.8774,
-            },
-            "AAPL": {
-                "ROI": 0.1760,
-                "CAGR": 0.0844,
-                "Number_of_Trades": 4,
-                "Final_Capital": 117600.00,
-                "Accuracy": 0.59,
-            },
-        },
-        "MFA_Multi_indicator": {
-            "Yuanta": {
-                "ROI": 1.0546,
-                "CAGR": 0.4334,
-                "Number_of_Trades": 4,
-                "Final_Capital": 205458.46,
-                "Accuracy": 0.7568,
-            },
-            "TATAMOTORS": {
-                "ROI": 1.5667,
-                "CAGR": 0.6021,
-                "Number_of_Trades": 2,
-                "Final_Capital": 256665.00,
-                "Accuracy": 0.7334,
-            },
-            "SHREECEMENT": {
-                "ROI": 0.6435,
-                "CAGR": 0.2820,
-                "Number_of_Trades": 7,
-                "Final_Capital": 164345.00,
-                "Accuracy": 0.5428,
-            },
-            "RIL": {
-                "ROI": 0.7496,
-                "CAGR": 0.3227,
-                "Number_of_Trades": 4,
-                "Final_Capital": 174960.00,
-                "Accuracy": 0.7217,
-            },
-            "HDFCBANK": {
-                "ROI": 0.1688,
-                "CAGR": 0.0811,
-                "Number_of_Trades": 3,
-                "Final_Capital": 116883.00,
-                "Accuracy": 0.8346,
-            },
-            "AAPL": {
-                "ROI": 0.7723,
-                "CAGR": 0.3313,
-                "Number_of_Trades": 6,
-                "Final_Capital": 177230.00,
-                "Accuracy": 0.5741,
-            },
-        },
-    }
-
-    # Convert the data dictionary to a DataFrame
-    df = pd.DataFrame(
-        [
-            {"Model": model, "Stock": stock, **metrics}
-            for model, stock_data in data.items()
-            for stock, metrics in stock_data.items()
-        ]
-    )
+    from sample_results import STOCKS, sample_results_frame
+    from transaction_costs import DEFAULT_COST, with_transaction_cost
+
+    # Cost-free results for every model and stock
+    df = sample_results_frame()
 
     # Define metrics to plot
     metrics = ["ROI", "CAGR", "Number_of_Trades", "Final_Capital", "Accuracy"]
 
     # Generate the plots
-    plot_model_performance(df, metrics, stocks)
+    plot_model_performance(df, metrics, STOCKS)
+
+    # The brokerage charts come from the same results with the per-trade cost applied
+    cost_df = with_transaction_cost(df[df["Model"] != "Actual Market"], DEFAULT_COST)
+    plot_model_performance(
+        cost_df, ["ROI", "CAGR", "Final_Capital"], STOCKS, cost=DEFAULT_COST
+    )
@@ -0,0 +1,278 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from backtest import INITIAL_CAPITAL, METRIC_COLUMNS, TRADING_DAYS_PER_YEAR
+
+MARKET_MODEL = "Actual Market"
+
+
+class MetricAccumulator:
+    """
+    Online version of backtest.run_backtest for one (model, stock) account.
+
+    Every new bar updates ROI, CAGR, Number_of_Trades, Final_Capital and Accuracy in O(1),
+    and accumulators built over consecutive time partitions can be merged.
+    """
+
+    __slots__ = (
+        "initial_capital",
+        "cost",
+        "periods_per_year",
+        "benchmark",
+        "n_bars",
+        "first_price",
+        "first_long",
+        "last_price",
+        "last_long",
+        "held",
+        "growth",
+        "n_trades",
+        "n_correct",
+        "n_calls",
+    )
+
+    def __init__(
+        self,
+        initial_capital=INITIAL_CAPITAL,
+        cost=0.0,
+        periods_per_year=TRADING_DAYS_PER_YEAR,
+        benchmark=False,
+    ):
+        self.initial_capital = initial_capital
+        self.cost = cost
+        self.periods_per_year = periods_per_year
+        # Benchmarks (buy-and-hold) report no trades and no accuracy, like backtest.buy_and_hold
+        self.benchmark = benchmark
+        self.n_bars = 0
+        self.first_price = None
+        self.first_long = False
+        self.last_price = None
+        self.last_long = False
+        self.held = False  # Position held over the most recent completed bar
+        self.growth = 1.0
+        self.n_trades = 0
+        self.n_correct = 0
+        self.n_calls = 0
+
+    def _step(self, price):
+        """Close the interval from last_price to price with the pending position."""
+        ret = price / self.last_price - 1.0
+        position = self.last_long
+        if position and not self.held:
+            self.n_trades += 1
+            self.growth *= 1.0 - self.cost
+        if position:
+            self.growth *= 1.0 + ret
+        self.n_calls += 1
+        self.n_correct += position == (ret > 0)
+        self.held = position
+
+    def update(self, price, signal=1):
+        """
+        Add the next bar.
+
+        Parameters:
+        - price (float): Close price of the bar.
+        - signal (float): Model signal on the bar; > 0 means "long until the next bar".
+        """
+        if self.n_bars == 0:
+            self.first_price = price
+            self.first_long = signal > 0
+        else:
+            self._step(price)
+        self.last_price = price
+        self.last_long = signal > 0
+        self.n_bars += 1
+
+    def merge(self, other):
+        """
+        Combine with the accumulator of the partition that directly follows this one in time.
+
+        Parameters:
+        - other (MetricAccumulator): Accumulator over the next bars of the same account.
+
+        Returns:
+        - MetricAccumulator: New accumulator covering both partitions.
+        """
+        if other.n_bars == 0:
+            return self.copy()
+        if self.n_bars == 0:
+            return other.copy()
+
+        merged = self.copy()
+        # Bridge the gap between the last bar of self and the first bar of other
+        merged._step(other.first_price)
+        bridge_long = merged.held
+
+        growth = other.growth
+        n_trades = other.n_trades
+        # other counted an entry on its first bar; it isn't one if the position carried over
+        if other.n_bars > 1 and other.first_long and bridge_long:
+            n_trades -= 1
+            growth /= 1.0 - self.cost
+
+        merged.growth *= growth
+        merged.n_trades += n_trades
+        merged.n_correct += other.n_correct
+        merged.n_calls += other.n_calls
+        merged.n_bars += other.n_bars
+        merged.last_price = other.last_price
+        merged.last_long = other.last_long
+        merged.held = other.held if other.n_bars > 1 else bridge_long
+        return merged
+
+    def copy(self):
+        """Return an independent copy of the accumulator."""
+        clone = MetricAccumulator.__new__(MetricAccumulator)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    @property
+    def roi(self):
+        return self.growth - 1.0
+
+    @property
+    def final_capital(self):
+        return self.initial_capital * self.growth
+
+    @property
+    def cagr(self):
+        intervals = self.n_bars - 1
+        if intervals < 1:
+            return math.nan
+        return self.growth ** (self.periods_per_year / intervals) - 1.0
+
+    @property
+    def accuracy(self):
+        if self.benchmark or self.n_calls == 0:
+            return math.nan
+        return self.n_correct / self.n_calls
+
+    def snapshot(self):
+        """Current metrics keyed by the METRIC_COLUMNS names."""
+        return {
+            "ROI": self.roi,
+            "CAGR": self.cagr,
+            "Number_of_Trades": 0 if self.benchmark else self.n_trades,
+            "Final_Capital": self.final_capital,
+            "Accuracy": self.accuracy,
+        }
+
+
+class StreamingMetricsBook:
+    """
+    Collection of MetricAccumulator objects keyed by (model, stock).
+
+    Snapshots come out in the DataFrame layout consumed by plot_model_performance.
+    """
+
+    def __init__(
+        self,
+        initial_capital=INITIAL_CAPITAL,
+        cost=0.0,
+        periods_per_year=TRADING_DAYS_PER_YEAR,
+    ):
+        self.initial_capital = initial_capital
+        self.cost = cost
+        self.periods_per_year = periods_per_year
+        self.accounts = {}
+
+    def _account(self, model, stock):
+        key = (model, stock)
+        account = self.accounts.get(key)
+        if account is None:
+            account = MetricAccumulator(
+                self.initial_capital,
+                self.cost,
+                self.periods_per_year,
+                benchmark=model == MARKET_MODEL,
+            )
+            self.accounts[key] = account
+        return account
+
+    def update(self, model, stock, price, signal=1):
+        """
+        Add the next bar of one (model, stock) account.
+
+        Parameters:
+        - model (str): Model name ('Actual Market' is tracked as buy-and-hold).
+        - stock (str): Stock name.
+        - price (float): Close price of the bar.
+        - signal (float): Model signal on the bar; ignored for 'Actual Market'.
+        """
+        if model == MARKET_MODEL:
+            signal = 1
+        self._account(model, stock).update(price, signal)
+
+    def update_bar(self, stock, price, signals):
+        """
+        Add one bar of a stock for the market benchmark and every model at once.
+
+        Parameters:
+        - stock (str): Stock name.
+        - price (float): Close price of the bar.
+        - signals (dict): Maps model name to its signal on the bar.
+        """
+        self.update(MARKET_MODEL, stock, price)
+        for model, signal in signals.items():
+            self.update(model, stock, price, signal)
+
+    def merge(self, other):
+        """
+        Combine with a book covering the directly following time partition.
+
+        Parameters:
+        - other (StreamingMetricsBook): Book over the next bars.
+
+        Returns:
+        - StreamingMetricsBook: New book covering both partitions.
+        """
+        merged = StreamingMetricsBook(
+            self.initial_capital, self.cost, self.periods_per_year
+        )
+        for key in self.accounts.keys() | other.accounts.keys():
+            empty = MetricAccumulator(
+                self.initial_capital,
+                self.cost,
+                self.periods_per_year,
+                benchmark=key[0] == MARKET_MODEL,
+            )
+            first = self.accounts.get(key, empty)
+            merged.accounts[key] = first.merge(other.accounts.get(key, empty))
+        return merged
+
+    def snapshot(self):
+        """
+        Current metrics of every account.
+
+        Returns:
+        - pd.DataFrame: One row per (model, stock) with columns 'Model', 'Stock' and the metrics.
+        """
+        rows = [
+            {"Model": model, "Stock": stock, **account.snapshot()}
+            for (model, stock), account in self.accounts.items()
+        ]
+        return pd.DataFrame(rows, columns=["Model", "Stock"] + METRIC_COLUMNS)
+
+
+# Example usage: stream synthetic bars and check against the vectorized backtest
+if __name__ == "__main__":
+    from backtest import run_backtest
+
+    rng = np.random.default_rng(3)
+    n_bars = 500
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n_bars)))
+    signals = rng.random(n_bars) > 0.5
+
+    # Two partitions streamed independently, then merged
+    first, second = StreamingMetricsBook(cost=0.003), StreamingMetricsBook(cost=0.003)
+    for i in range(n_bars):
+        book = first if i < n_bars // 2 else second
+        book.update_bar("AAPL", prices[i], {"MFA_STFT": signals[i]})
+    print(first.merge(second).snapshot())
+
+    expected = run_backtest(prices, signals, cost=0.003)
+    print({name: round(float(value), 4) for name, value in expected.items()})
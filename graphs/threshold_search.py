@@ -0,0 +1,315 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import results_frame, run_backtest
+from indicators import IndicatorEngine
+
+DIRECTIONS = ("below", "above")
+
+# Per-process cache handle set up once by _init_worker
+_WORKER = {}
+
+
+class IndicatorCache:
+    """
+    Directory of memory-mapped indicator arrays shared by every configuration.
+
+    Each distinct (indicator, params) pair is computed once over the whole price history
+    and saved as one .npy file per output; configurations that only differ in their
+    thresholds read the same arrays, and worker processes map the files instead of
+    recomputing or unpickling them. Output names include a fingerprint of the stored
+    prices, so reopening the directory with other prices never serves stale outputs.
+    """
+
+    def __init__(self, directory, close=None, high=None, low=None):
+        """
+        Parameters:
+        - directory (str): Cache directory (created if needed).
+        - close (array-like, optional): Close prices shaped (n_stocks, n_bars); stored in
+          the directory so readers only need the path.
+        - high (array-like, optional): High prices, required by 'atr'.
+        - low (array-like, optional): Low prices, required by 'atr'.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        prices = {"close": close, "high": high, "low": low}
+        if any(values is not None for values in prices.values()):
+            fingerprint = hashlib.sha256()
+            for name, values in prices.items():
+                path = self._path(name)
+                if values is None:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    continue
+                values = np.ascontiguousarray(values, dtype=np.float64)
+                fingerprint.update(f"{name}{values.shape}".encode())
+                fingerprint.update(values.tobytes())
+                self._write(path, lambda fh, values=values: np.save(fh, values))
+            self._write(
+                self._path("prices", ".sha256"),
+                lambda fh: fh.write(fingerprint.hexdigest()[:16].encode()),
+            )
+        with open(self._path("prices", ".sha256")) as fh:
+            self.fingerprint = fh.read()
+
+    def __reduce__(self):
+        # Pickle as the directory only; the receiving process maps the files itself
+        return (IndicatorCache, (self.directory,))
+
+    def _path(self, name, suffix=".npy"):
+        return os.path.join(self.directory, f"{name}{suffix}")
+
+    def _write(self, path, write):
+        """Write a file through a temporary name so readers never see it partial."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                write(fh)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def key(self, indicator, params):
+        """Hex digest naming the outputs of one indicator configuration on these prices."""
+        header = json.dumps(
+            {"indicator": indicator, "params": params, "prices": self.fingerprint},
+            sort_keys=True,
+        )
+        return hashlib.sha256(header.encode()).hexdigest()[:16]
+
+    def prices(self, name="close"):
+        """Memory-mapped price array stored with the cache."""
+        return np.load(self._path(name), mmap_mode="r")
+
+    def ensure(self, indicator, params):
+        """Compute and store the outputs of an indicator configuration unless present."""
+        key = self.key(indicator, params)
+        marker = self._path(key, ".done")
+        if os.path.exists(marker):
+            return
+        hlc = [
+            self.prices(name) if os.path.exists(self._path(name)) else None
+            for name in ("close", "high", "low")
+        ]
+        outputs = IndicatorEngine({indicator: params}).compute(*hlc)
+        for output, values in outputs.items():
+            self._write(
+                self._path(f"{key}_{output}"),
+                lambda fh, values=values: np.save(fh, values),
+            )
+        # The marker is written last, once every output is complete
+        self._write(marker, lambda fh: fh.write(json.dumps(sorted(outputs)).encode()))
+
+    def load(self, indicator, params, output):
+        """Memory-mapped array of one indicator output shaped (n_stocks, n_bars)."""
+        return np.load(
+            self._path(f"{self.key(indicator, params)}_{output}"), mmap_mode="r"
+        )
+
+
+def config_grid(indicator, params, output, thresholds, directions=DIRECTIONS):
+    """
+    Threshold configurations of one indicator output.
+
+    Parameters:
+    - indicator (str): IndicatorEngine indicator name (e.g., 'rsi').
+    - params (dict): Parameters of the indicator (e.g., {'period': 14}).
+    - output (str): Output used as the signal (e.g., 'rsi_14').
+    - thresholds (array-like): Threshold values to try.
+    - directions (tuple): 'below' (long while output < threshold) and/or 'above'.
+
+    Returns:
+    - list: Configuration dicts.
+    """
+    return [
+        {
+            "indicator": indicator,
+            "params": dict(params),
+            "output": output,
+            "threshold": float(threshold),
+            "direction": direction,
+        }
+        for threshold in thresholds
+        for direction in directions
+    ]
+
+
+def config_signals(values, config):
+    """Long/flat signals of a configuration from its indicator output values."""
+    if config["direction"] == "below":
+        return values < config["threshold"]
+    return values > config["threshold"]
+
+
+def evaluate_config(cache, config, end, metric="ROI", cost=0.0):
+    """
+    Score one configuration over the first end bars of every stock.
+
+    Parameters:
+    - cache (IndicatorCache): Cache holding the prices and the configuration's indicator.
+    - config (dict): Configuration from config_grid.
+    - end (int): Number of bars to evaluate.
+    - metric (str): Backtest metric to average across stocks (e.g., 'ROI' or 'CAGR').
+    - cost (float): Proportional cost charged per trade.
+
+    Returns:
+    - float: Mean metric across stocks.
+    """
+    values = cache.load(config["indicator"], config["params"], config["output"])
+    close = cache.prices()[:, :end]
+    signals = config_signals(np.asarray(values[:, :end]), config)
+    return float(np.nanmean(run_backtest(close, signals, cost=cost)[metric]))
+
+
+def config_results(cache, config, model, stocks, cost=0.0):
+    """
+    Full-history metrics of one configuration in the graphs DataFrame layout.
+
+    Parameters:
+    - cache (IndicatorCache): Cache holding the prices and the configuration's indicator.
+    - config (dict): Configuration, e.g. the best one from successive_halving.
+    - model (str): Model name of the rows.
+    - stocks (list): Stock names, one per price row.
+    - cost (float): Proportional cost charged per trade.
+
+    Returns:
+    - pd.DataFrame: One row per stock with 'Model', 'Stock' and the metrics.
+    """
+    cache.ensure(config["indicator"], config["params"])
+    values = cache.load(config["indicator"], config["params"], config["output"])
+    signals = config_signals(np.asarray(values), config)
+    return results_frame(
+        run_backtest(cache.prices(), signals, cost=cost), [model], stocks
+    )
+
+
+def _init_worker(cache):
+    _WORKER["cache"] = cache
+
+
+def _evaluate_job(args):
+    index, config, end, metric, cost = args
+    return index, evaluate_config(_WORKER["cache"], config, end, metric, cost)
+
+
+def rung_lengths(n_bars, min_bars, eta=3):
+    """Bars evaluated at every rung: min_bars growing by eta up to the full history."""
+    lengths = []
+    length = min_bars
+    while length < n_bars:
+        lengths.append(length)
+        length *= eta
+    return lengths + [n_bars]
+
+
+def successive_halving(
+    cache,
+    configs,
+    min_bars=126,
+    eta=3,
+    metric="ROI",
+    cost=0.0,
+    max_workers=None,
+):
+    """
+    Search threshold configurations with successive halving over growing date ranges.
+
+    Every configuration is first scored on the earliest min_bars bars; only the best
+    1/eta of them move on to a range eta times longer, until one rung covers the whole
+    history. Cheap short-range evaluations prune most configurations, and the
+    indicators are computed once per distinct (indicator, params) in the shared cache.
+
+    Parameters:
+    - cache (IndicatorCache): Cache created with the close prices (and high/low for 'atr').
+    - configs (list): Configurations from config_grid.
+    - min_bars (int): Bars evaluated at the first rung.
+    - eta (int): Pruning factor between rungs.
+    - metric (str): Backtest metric averaged across stocks; higher is better.
+    - cost (float): Proportional cost charged per trade.
+    - max_workers (int, optional): Worker processes; 1 runs in the current process.
+
+    Returns:
+    - tuple: (best configuration dict, pd.DataFrame with one row per evaluation:
+      'Config', 'Rung', 'Bars', 'Score' and the configuration fields).
+    """
+    for indicator, params in {
+        cache.key(c["indicator"], c["params"]): (c["indicator"], c["params"])
+        for c in configs
+    }.values():
+        cache.ensure(indicator, params)
+
+    n_bars = cache.prices().shape[1]
+    survivors = list(range(len(configs)))
+    rows = []
+    executor = (
+        None
+        if max_workers == 1
+        else ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(cache,)
+        )
+    )
+    if executor is None:
+        _init_worker(cache)
+    try:
+        for rung, end in enumerate(rung_lengths(n_bars, min_bars, eta)):
+            jobs = [(index, configs[index], end, metric, cost) for index in survivors]
+            if executor is None:
+                scores = dict(map(_evaluate_job, jobs))
+            else:
+                scores = dict(executor.map(_evaluate_job, jobs, chunksize=4))
+            rows.extend(
+                {
+                    "Config": index,
+                    "Rung": rung,
+                    "Bars": end,
+                    "Score": score,
+                    **configs[index],
+                }
+                for index, score in scores.items()
+            )
+            ranked = sorted(survivors, key=lambda index: scores[index], reverse=True)
+            survivors = ranked[: max(1, -(-len(ranked) // eta))]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return configs[survivors[0]], pd.DataFrame(rows)
+
+
+# Example usage: 400 RSI/MACD threshold configurations over a synthetic universe
+if __name__ == "__main__":
+    rng = np.random.default_rng(22)
+    n_stocks, n_bars = 200, 2520
+    close = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0003, 0.02, (n_stocks, n_bars)), axis=1)
+    )
+    configs = config_grid("rsi", {"period": 14}, "rsi_14", np.linspace(10, 90, 100))
+    configs += config_grid("rsi", {"period": 7}, "rsi_7", np.linspace(10, 90, 50))
+    configs += config_grid(
+        "macd",
+        {"fast": 12, "slow": 26, "signal": 9},
+        "macd_hist",
+        np.linspace(-1.0, 1.0, 50),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = IndicatorCache(tmp, close)
+        start = time.perf_counter()
+        best, history = successive_halving(cache, configs, metric="CAGR", cost=0.003)
+        elapsed = time.perf_counter() - start
+        stocks = [f"STOCK{i:03d}" for i in range(n_stocks)]
+        tuned = config_results(cache, best, "RSI_Tuned", stocks, cost=0.003)
+    print(
+        f"Searched {len(configs)} configurations with {len(history)} evaluations "
+        f"(vs {len(configs) * len(rung_lengths(n_bars, 126))} without pruning) in {elapsed:.2f}s"
+    )
+    print("Best:", best)
+    print(history.groupby("Rung")[["Bars", "Score"]].agg(["count", "max"]))
+    print(tuned.head())
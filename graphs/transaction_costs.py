@@ -0,0 +1,133 @@
+import numpy as np
+
+# Brokerage charged per trade in the original comparison charts (0.3%)
+DEFAULT_COST = 0.003
+
+# Cost levels from 0% to 1% in 1 basis point steps
+COST_GRID = np.round(np.arange(0, 101) * 1e-4, 4)
+
+
+def cost_factor(n_trades, cost):
+    """
+    Fraction of capital left after paying a proportional cost on every trade.
+
+    Each trade deducts `cost` from the account value at entry, so the costs of a whole
+    trade ledger compound to (1 - cost) ** n_trades. Both arguments broadcast, so a grid
+    of cost levels can be applied to many accounts at once.
+
+    Parameters:
+    - n_trades (array-like): Number of trades per account.
+    - cost (float or array-like): Proportional cost per trade (e.g., 0.003 for 0.3%).
+
+    Returns:
+    - np.ndarray: Multiplicative factor applied to the account's final capital.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if np.any((cost < 0) | (cost >= 1)):
+        raise ValueError("Transaction cost must be in the range [0, 1)")
+    return (1.0 - cost) ** np.asarray(n_trades, dtype=np.float64)
+
+
+def _horizons(roi, cagr, years=None):
+    """
+    Backtest length in years of every row.
+
+    (1 + ROI) == (1 + CAGR) ** years, so years falls out of the two cost-free columns.
+    Rows where it can't (ROI and CAGR both 0) take the median horizon of the others,
+    since the rows of one results frame normally share their backtest period.
+    """
+    if years is not None:
+        return np.broadcast_to(np.asarray(years, dtype=np.float64), roi.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        horizons = np.log1p(roi) / np.log1p(cagr)
+    known = np.isfinite(horizons) & (horizons > 0)
+    if known.any() and not known.all():
+        horizons = np.where(known, horizons, np.median(horizons[known]))
+    return horizons
+
+
+def cost_sweep(df, costs=COST_GRID, years=None):
+    """
+    Evaluate cost-free results under a whole grid of transaction cost levels in one pass.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'ROI', 'CAGR', 'Final_Capital' and
+      'Number_of_Trades' computed without costs.
+    - costs (array-like): Cost levels to evaluate (defaults to 0-1% in 1bp steps).
+    - years (float, optional): Length of the backtest in years. When omitted it is
+      recovered per row from the cost-free ROI and CAGR.
+
+    Returns:
+    - dict: 'ROI', 'CAGR' and 'Final_Capital' arrays shaped (len(df), len(costs)), plus
+      the 'Cost' grid itself.
+    """
+    costs = np.atleast_1d(np.asarray(costs, dtype=np.float64))
+    roi = df["ROI"].to_numpy(dtype=np.float64)
+    cagr = df["CAGR"].to_numpy(dtype=np.float64)
+    factor = cost_factor(df["Number_of_Trades"].to_numpy()[:, None], costs)
+    net_growth = (1.0 + roi[:, None]) * factor
+    horizons = _horizons(roi, cagr, years)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        net_cagr = net_growth ** (1.0 / horizons) - 1.0
+    # Rows without trades (or without any recoverable horizon) keep their CAGR
+    keep = (factor == 1.0) | ~np.isfinite(net_cagr)
+    return {
+        "Cost": costs,
+        "ROI": net_growth - 1.0,
+        "CAGR": np.where(keep, cagr[:, None], net_cagr),
+        "Final_Capital": df["Final_Capital"].to_numpy(dtype=np.float64)[:, None]
+        * factor,
+    }
+
+
+def sweep_frame(df, sweep, level):
+    """
+    Copy of a results DataFrame with the metrics of one cost level of a sweep.
+
+    Parameters:
+    - df (pd.DataFrame): The DataFrame passed to cost_sweep.
+    - sweep (dict): Output of cost_sweep.
+    - level (int): Index into sweep['Cost'].
+
+    Returns:
+    - pd.DataFrame: Copy of df with ROI, CAGR and Final_Capital net of that cost.
+    """
+    df = df.copy()
+    for column in ("ROI", "CAGR", "Final_Capital"):
+        df[column] = sweep[column][:, level]
+    return df
+
+
+def with_transaction_cost(df, cost=DEFAULT_COST, years=None):
+    """
+    Return a copy of a results DataFrame with a per-trade cost applied.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame with columns 'ROI', 'CAGR', 'Final_Capital' and
+      'Number_of_Trades' computed without costs.
+    - cost (float): Proportional cost per trade (e.g., 0.003 for 0.3%); use cost_sweep
+      for a grid of levels.
+    - years (float, optional): Length of the backtest in years. When omitted it is
+      recovered per row from the cost-free ROI and CAGR.
+
+    Returns:
+    - pd.DataFrame: Copy of df with ROI, CAGR and Final_Capital net of costs.
+    """
+    if np.ndim(cost) != 0:
+        raise ValueError("with_transaction_cost takes one cost level; use cost_sweep")
+    return sweep_frame(df, cost_sweep(df, [cost], years), 0)
+
+
+# Example usage: sweep the cost grid over the sample results
+if __name__ == "__main__":
+    from sample_results import sample_results_frame
+
+    df = sample_results_frame()
+    df = df[df["Model"] != "Actual Market"]
+    sweep = cost_sweep(df)
+    for bp in [0, 10, 30, 50, 100]:
+        roi = sweep_frame(df, sweep, bp).groupby("Model", sort=False)["ROI"].mean()
+        print(
+            f"cost {sweep['Cost'][bp] * 100:.2f}% -> mean ROI "
+            + ", ".join(f"{r * 100:6.2f}%" for r in roi)
+        )
@@ -0,0 +1,418 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import (
+    INITIAL_CAPITAL,
+    METRIC_COLUMNS,
+    TRADING_DAYS_PER_YEAR,
+    run_backtest,
+)
+from indicators import DEFAULT_INDICATORS, IndicatorEngine
+
+FEATURE_DTYPE = np.float32
+
+# Bump when the feature computation changes so old cached folds stop matching
+FEATURE_VERSION = 1
+
+
+def walk_forward_splits(n_bars, train_size, test_size, step=None, expanding=False):
+    """
+    Consecutive (train, test) bar ranges that walk forward through a history.
+
+    Parameters:
+    - n_bars (int): Length of the history.
+    - train_size (int): Bars in each training window (the first one when expanding).
+    - test_size (int): Bars in each test window.
+    - step (int, optional): Bars between consecutive folds (defaults to test_size).
+    - expanding (bool): Grow the training window from bar 0 instead of sliding it.
+
+    Returns:
+    - list: (train slice, test slice) tuples, in time order.
+    """
+    step = test_size if step is None else step
+    if min(train_size, test_size, step) < 1:
+        raise ValueError("train_size, test_size and step must be positive")
+    splits = []
+    for test_start in range(train_size, n_bars - test_size + 1, step):
+        train_start = 0 if expanding else test_start - train_size
+        splits.append(
+            (slice(train_start, test_start), slice(test_start, test_start + test_size))
+        )
+    return splits
+
+
+class FoldFeatureCache:
+    """
+    On-disk cache of per-fold feature matrices.
+
+    Each matrix is stored as one .npy file under a hash of (stock, date range, feature
+    parameters, position in the history, input prices), so re-running an evaluation
+    with the same folds and prices loads the features instead of recomputing them.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, stock, start, end, params, offset=0, digest=None):
+        """
+        Hash a feature request.
+
+        Features are causal from the first bar of the history, so besides the window
+        the key covers where the window sits in the history and the prices leading up
+        to its end.
+
+        Parameters:
+        - stock (str): Stock name.
+        - start (str or np.datetime64): First date of the range.
+        - end (str or np.datetime64): Last date of the range.
+        - params (dict): JSON-serializable feature parameters.
+        - offset (int): Bars of history before the first date of the range.
+        - digest (str, optional): Hash of the input prices up to the end of the range
+          (see FoldFeatureBuilder.input_digest).
+
+        Returns:
+        - str: Hex digest identifying the matrix.
+        """
+        header = {
+            "version": FEATURE_VERSION,
+            "stock": stock,
+            "start": str(start),
+            "end": str(end),
+            "params": params,
+            "offset": int(offset),
+            "digest": digest,
+        }
+        return hashlib.sha256(
+            json.dumps(header, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, key):
+        """
+        Load a cached matrix.
+
+        Parameters:
+        - key (str): Key from key().
+
+        Returns:
+        - np.ndarray or None: The matrix, or None on a miss.
+        """
+        try:
+            return np.load(self._path(key))
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, features):
+        """
+        Store a matrix atomically, so concurrent readers never see a partial file.
+
+        Parameters:
+        - key (str): Key from key().
+        - features (np.ndarray): Feature matrix to store.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npy")
+        with os.fdopen(fd, "wb") as fh:
+            np.save(fh, features)
+        os.replace(tmp, self._path(key))
+
+    def clear(self):
+        """Remove every cached matrix."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                os.remove(os.path.join(self.directory, name))
+
+
+class FoldFeatureBuilder:
+    """
+    Builds the feature matrices of one stock for a sequence of forward-moving windows.
+
+    Features are causal indicators computed from the start of the history, so the
+    features of a bar never depend on the window asking for it. Consecutive folds
+    overlap, and the builder keeps the bars it already computed: a new window only runs
+    the IndicatorEngine over the bars past the previous window's end (the engine carries
+    its EMA states and the short close lookback itself).
+    """
+
+    def __init__(self, close, high=None, low=None, indicators=None):
+        """
+        Parameters:
+        - close (array-like): Close prices of one stock shaped (n_bars,).
+        - high (array-like, optional): High prices, required by 'atr'.
+        - low (array-like, optional): Low prices, required by 'atr'.
+        - indicators (dict, optional): IndicatorEngine configuration.
+        """
+        self.close = np.asarray(close, dtype=np.float64)
+        self.high = None if high is None else np.asarray(high, dtype=np.float64)
+        self.low = None if low is None else np.asarray(low, dtype=np.float64)
+        self.engine = IndicatorEngine(indicators)
+        # Output names, known up front so cached folds can be read without computing
+        dummy = np.ones((1, 2))
+        self.columns = sorted(IndicatorEngine(indicators).compute(dummy, dummy, dummy))
+        # Features of bars [_start, engine.n_bars)
+        self._start = 0
+        self._buffer = np.empty((0, 0), dtype=FEATURE_DTYPE)
+        self.bars_computed = 0
+        # Running hash of the input bars [0, _hashed)
+        self._digest = hashlib.sha256()
+        self._hashed = 0
+
+    def _input_rows(self, window):
+        columns = [
+            c[window] for c in (self.close, self.high, self.low) if c is not None
+        ]
+        return np.ascontiguousarray(np.column_stack(columns))
+
+    def input_digest(self, end):
+        """
+        Hash of the input prices of bars [0, end), which the features up to end depend on.
+
+        The hash is extended as windows move forward, so consecutive folds only hash
+        their new bars.
+        """
+        if end < self._hashed:
+            digest = hashlib.sha256(self._input_rows(slice(0, end)).tobytes())
+        else:
+            self._digest.update(self._input_rows(slice(self._hashed, end)).tobytes())
+            self._hashed = end
+            digest = self._digest
+        return digest.hexdigest()[:32]
+
+    def _extend(self, end):
+        """Run the engine up to bar end and append the new rows to the buffer."""
+        begin = self.engine.n_bars
+        if end <= begin:
+            return
+        window = slice(begin, end)
+        new = self.engine.append(
+            self.close[None, window],
+            None if self.high is None else self.high[None, window],
+            None if self.low is None else self.low[None, window],
+        )
+        rows = np.stack([new[name][0] for name in self.columns], axis=1)
+        rows = rows.astype(FEATURE_DTYPE)
+        self._buffer = (
+            rows if len(self._buffer) == 0 else np.vstack([self._buffer, rows])
+        )
+        self.bars_computed += end - begin
+
+    def features(self, start, end):
+        """
+        Feature matrix of bars [start, end).
+
+        Windows must not start before an earlier window did; bars before start are
+        dropped from the buffer.
+
+        Parameters:
+        - start (int): First bar.
+        - end (int): One past the last bar.
+
+        Returns:
+        - np.ndarray: Features shaped (end - start, n_features), in self.columns order.
+        """
+        if start < self._start:
+            raise ValueError("Windows must move forward in time")
+        self._extend(end)
+        self._buffer = self._buffer[start - self._start :]
+        self._start = start
+        return self._buffer[: end - start]
+
+
+def fold_features(builder, stock, dates, start, end, cache=None, params=None):
+    """
+    Features of one fold window, loaded from the cache or built (and cached) on a miss.
+
+    Parameters:
+    - builder (FoldFeatureBuilder): Builder of the stock.
+    - stock (str): Stock name, part of the cache key.
+    - dates (np.ndarray): Bar dates of the history.
+    - start (int): First bar of the window.
+    - end (int): One past the last bar of the window.
+    - cache (FoldFeatureCache, optional): Cache to consult.
+    - params (dict, optional): Feature parameters, part of the cache key.
+
+    Returns:
+    - np.ndarray: Features shaped (end - start, n_features).
+    """
+    if cache is None:
+        return builder.features(start, end)
+    key = cache.key(
+        stock,
+        dates[start],
+        dates[end - 1],
+        params,
+        offset=start,
+        digest=builder.input_digest(end),
+    )
+    features = cache.get(key)
+    if features is None:
+        features = builder.features(start, end)
+        cache.put(key, features)
+    return features
+
+
+def summarize_folds(fold_df, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """
+    Chain per-fold results into one row per (model, stock), in the graphs layout.
+
+    ROI and Final_Capital compound the fold growths, CAGR annualizes the compounded
+    growth over all test bars, trades add up and Accuracy averages weighted by bars.
+
+    Parameters:
+    - fold_df (pd.DataFrame): Output of walk_forward_evaluate.
+    - periods_per_year (int): Bars per year, used to annualize CAGR.
+
+    Returns:
+    - pd.DataFrame: One row per (model, stock) with columns 'Model', 'Stock' and METRIC_COLUMNS.
+    """
+    frame = fold_df.assign(
+        Growth=1.0 + fold_df["ROI"],
+        Hits=fold_df["Accuracy"] * fold_df["Bars"],
+    )
+    grouped = frame.groupby(["Model", "Stock"], sort=False, observed=True)
+    summary = grouped.agg(
+        Growth=("Growth", "prod"),
+        Number_of_Trades=("Number_of_Trades", "sum"),
+        Hits=("Hits", "sum"),
+        Bars=("Bars", "sum"),
+    ).reset_index()
+    growth = summary.pop("Growth")
+    bars = summary.pop("Bars")
+    summary["ROI"] = growth - 1.0
+    summary["CAGR"] = growth ** (periods_per_year / bars) - 1.0
+    summary["Final_Capital"] = INITIAL_CAPITAL * growth
+    summary["Accuracy"] = summary.pop("Hits") / bars
+    return summary[["Model", "Stock"] + METRIC_COLUMNS]
+
+
+def walk_forward_evaluate(
+    close,
+    stocks,
+    dates,
+    models,
+    splits,
+    high=None,
+    low=None,
+    indicators=None,
+    cache=None,
+    cost=0.0,
+):
+    """
+    Fit and test every model on every walk-forward fold of every stock.
+
+    Each fold needs the features of its train and test windows; they are served from
+    one FoldFeatureBuilder per stock (so overlapping folds share computed bars) and the
+    optional on-disk cache.
+
+    Parameters:
+    - close (array-like): Close prices shaped (n_stocks, n_bars).
+    - stocks (list): Stock names, one per row.
+    - dates (array-like): Bar dates, one per column.
+    - models (dict): Maps model name to fit_predict(train_features, train_close,
+      test_features, columns) -> signals for the test bars.
+    - splits (list): (train slice, test slice) tuples from walk_forward_splits.
+    - high (array-like, optional): High prices, required by 'atr'.
+    - low (array-like, optional): Low prices, required by 'atr'.
+    - indicators (dict, optional): IndicatorEngine configuration.
+    - cache (FoldFeatureCache, optional): On-disk cache of fold features.
+    - cost (float): Proportional cost charged per trade.
+
+    Returns:
+    - pd.DataFrame: One row per (model, stock, fold) with 'Model', 'Stock', 'Fold',
+      'Start', 'End', 'Bars' and METRIC_COLUMNS.
+    """
+    close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    params = DEFAULT_INDICATORS if indicators is None else indicators
+    rows = []
+    for row, stock in enumerate(stocks):
+        builder = FoldFeatureBuilder(
+            close[row],
+            None if high is None else high[row],
+            None if low is None else low[row],
+            params,
+        )
+        for fold, (train, test) in enumerate(splits):
+            # One window covering train and test, so the builder walks strictly forward
+            features = fold_features(
+                builder, stock, dates, train.start, test.stop, cache, params
+            )
+            split = train.stop - train.start
+            prices = close[row, test]
+            for name, fit_predict in models.items():
+                signals = fit_predict(
+                    features[:split],
+                    close[row, train],
+                    features[split:],
+                    builder.columns,
+                )
+                metrics = run_backtest(prices, signals, cost=cost)
+                rows.append(
+                    {
+                        "Model": name,
+                        "Stock": stock,
+                        "Fold": fold,
+                        "Start": dates[test.start],
+                        "End": dates[test.stop - 1],
+                        "Bars": len(prices) - 1,
+                        **{column: metrics[column].item() for column in METRIC_COLUMNS},
+                    }
+                )
+    return pd.DataFrame(rows)
+
+
+def rsi_threshold_model(
+    train_features, train_close, test_features, columns, quantile=0.3
+):
+    """Example model: long while RSI is below the quantile it had in the training window."""
+    rsi = columns.index("rsi_14")
+    threshold = np.nanquantile(train_features[:, rsi], quantile)
+    return test_features[:, rsi] < threshold
+
+
+# Example usage: walk-forward folds over a synthetic universe, cold and warm cache
+if __name__ == "__main__":
+    from functools import partial
+
+    rng = np.random.default_rng(15)
+    n_stocks, n_bars = 50, 2520
+    stocks = [f"STOCK{i:02d}" for i in range(n_stocks)]
+    dates = np.datetime64("2015-01-01") + np.arange(n_bars)
+    close = 100.0 * np.exp(
+        np.cumsum(rng.normal(0.0003, 0.02, (n_stocks, n_bars)), axis=1)
+    )
+    spread = close * rng.uniform(0.0, 0.02, close.shape)
+    splits = walk_forward_splits(n_bars, train_size=504, test_size=63)
+    models = {
+        "RSI_q30": rsi_threshold_model,
+        "RSI_q50": partial(rsi_threshold_model, quantile=0.5),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FoldFeatureCache(tmp)
+        for label in ["cold", "warm"]:
+            start = time.perf_counter()
+            folds = walk_forward_evaluate(
+                close,
+                stocks,
+                dates,
+                models,
+                splits,
+                close + spread,
+                close - spread,
+                cache=cache,
+                cost=0.003,
+            )
+            print(
+                f"{label} cache: {len(splits)} folds x {n_stocks} stocks in "
+                f"{time.perf_counter() - start:.2f}s"
+            )
+    print(summarize_folds(folds).head())